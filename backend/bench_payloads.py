@@ -0,0 +1,86 @@
+"""
+Micro-benchmark: JSON rendering and response compression for large payloads.
+
+Builds synthetic /api/ticker/{ticker} and /api/portfolio/history payloads of
+realistic shape and compares, per response:
+  - render:  FastAPI's stdlib JSONResponse vs _FastJSONResponse (orjson)
+  - wire:    identity vs gzip vs brotli (when installed) bytes and CPU time
+
+Usage:  python bench_payloads.py [--rows 2000] [--repeat 50]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from fastapi.responses import JSONResponse
+
+from main import _FastJSONResponse, _compress, brotli, orjson
+
+
+def _ticker_history(n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    d = date(2018, 1, 2)
+    rows = []
+    while len(rows) < n:
+        if d.weekday() < 5:
+            ntm = round(rng.uniform(2, 20), 4)
+            rows.append({
+                "date": d.isoformat(), "score": round(rng.uniform(0, 40), 4),
+                "adj_score": round(rng.uniform(0, 40), 4), "adj_gap": round(rng.uniform(-30, 30), 4),
+                "price": round(rng.uniform(10, 900), 2), "ma60": round(rng.uniform(10, 900), 2),
+                "ntm_current": ntm, "ntm_7d": ntm * 0.99, "ntm_30d": ntm * 0.97,
+                "ntm_60d": ntm * 0.95, "ntm_90d": ntm * 0.93,
+                "part2_rank": rng.choice([None] + list(range(1, 31))), "rev_up30": rng.randint(0, 20),
+                "rev_down30": rng.randint(0, 5), "num_analysts": rng.randint(3, 50),
+                "composite_rank": rng.randint(1, 400), "rev_growth": round(rng.uniform(-20, 80), 1),
+                "seg1": round(rng.uniform(-5, 5), 2), "seg2": round(rng.uniform(-5, 5), 2),
+                "seg3": round(rng.uniform(-5, 5), 2), "seg4": round(rng.uniform(-5, 5), 2),
+            })
+        d += timedelta(days=1)
+    return {"ticker": "NVDA", "short_name": "NVIDIA Corporation", "industry_en": "Semiconductors",
+            "industry_kr": "반도체", "history": rows}
+
+
+def _portfolio_history(n: int, seed: int = 2) -> list:
+    rng = random.Random(seed)
+    return [
+        {"date": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}", "ticker": f"T{rng.randint(0, 499):03d}",
+         "action": rng.choice(["enter", "hold", "exit"]), "price": round(rng.uniform(10, 900), 2),
+         "weight": 20.0, "entry_date": "2025-01-02", "entry_price": round(rng.uniform(10, 900), 2),
+         "exit_price": None, "return_pct": round(rng.uniform(-30, 60), 2),
+         "short_name": "Example Holdings Inc.", "industry_kr": "반도체"}
+        for i in range(n)
+    ]
+
+
+def _timed(fn, repeat: int):
+    t0 = time.process_time()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.process_time() - t0) / repeat * 1e3
+
+
+def bench(name: str, payload, repeat: int):
+    before, t_before = _timed(lambda: JSONResponse(payload).body, repeat)
+    after, t_after = _timed(lambda: _FastJSONResponse(payload).body, repeat)
+    print(f"{name}")
+    print(f"  render   stdlib={t_before:8.3f} ms  fast={t_after:8.3f} ms  "
+          f"speedup={t_before / t_after:5.1f}x  ({'orjson' if orjson else 'stdlib fallback'})")
+    print(f"  wire     identity={len(before):>9,} B  cpu=   0.000 ms")
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for enc in encodings:
+        body, t_enc = _timed(lambda: _compress(after, enc), repeat)
+        print(f"           {enc:<8}={len(body):>9,} B  cpu={t_enc:8.3f} ms  "
+              f"ratio={len(before) / len(body):5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="rows per payload")
+    parser.add_argument("--repeat", type=int, default=50, help="timing repetitions")
+    args = parser.parse_args()
+
+    bench(f"/api/ticker/{{ticker}}  ({args.rows} rows)", _ticker_history(args.rows), args.repeat)
+    bench(f"/api/portfolio/history  ({args.rows} rows)", _portfolio_history(args.rows), args.repeat)
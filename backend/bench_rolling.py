@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: incremental rolling order statistics vs the pandas path.
+
+Compares, per refresh that adds one new observation:
+  - pandas: rolling(2520, min_periods=1260).median() over the full HY history
+            and rolling(252, min_periods=126).rank(pct=True) over VIX
+  - _RollingSeries: push the new observation, read the latest value
+
+Results are checked for exact equality before timing. The VIX 20-day
+moving average (math.fsum over the last 20 values) is compared with
+pandas rolling(20).mean() as served, rounded to 2 decimals. pandas keeps
+a running sum, so it can be off by an ulp; that only changes the rounded
+value when the exact mean sits on a half-cent tie (e.g. 15.125), where
+fsum rounds the exact value. Any other mismatch is reported separately.
+
+Usage:  python bench_rolling.py [--days 250]
+"""
+
+import argparse
+import math
+import random
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from main import _RollingSeries
+
+
+def _synthetic_series(n: int, start: float, vol: float, floor: float, seed: int) -> list[tuple[str, float]]:
+    rng = random.Random(seed)
+    d = date(2010, 1, 4)
+    v = start
+    out = []
+    while len(out) < n:
+        if d.weekday() < 5:
+            v = max(floor, v + rng.gauss(0, vol))
+            out.append((d.isoformat(), round(v, 2)))
+        d += timedelta(days=1)
+    return out
+
+
+def _same(a: float, b: float) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+def bench(name: str, history: list, window: int, min_periods: int, days: int, stat: str):
+    base, new_obs = history[:-days], history[-days:]
+    frame_len = len(base)
+
+    # pandas: full recompute over a sliding frame of constant length
+    t0 = time.perf_counter()
+    pandas_out = []
+    for k in range(1, days + 1):
+        vals = pd.Series([v for _, v in history[k:frame_len + k]])
+        roll = vals.rolling(window, min_periods=min_periods)
+        res = roll.median() if stat == "median" else roll.rank(pct=True)
+        pandas_out.append(float(res.iloc[-1]))
+    t_pandas = time.perf_counter() - t0
+
+    # incremental: warm once, then one push per refresh
+    state = _RollingSeries(window, min_periods)
+    state.update(base)
+    t0 = time.perf_counter()
+    inc_out = []
+    for k in range(1, days + 1):
+        frame = history[k:frame_len + k]
+        vals = state.update(frame)
+        inc_out.append(state.median_at(len(vals) - 1) if stat == "median" else state.pct_rank_last())
+    t_inc = time.perf_counter() - t0
+
+    mismatches = sum(1 for a, b in zip(pandas_out, inc_out) if not _same(a, b))
+    print(
+        f"{name:<28} frame={frame_len:<5} refreshes={days:<4} "
+        f"pandas={t_pandas / days * 1e3:8.3f} ms  incremental={t_inc / days * 1e3:8.3f} ms  "
+        f"speedup={t_pandas / t_inc:6.1f}x  mismatches={mismatches}"
+    )
+
+
+def bench_ma(name: str, history: list, window: int, days: int):
+    frame_len = len(history) - days
+    pandas_out, fsum_out = [], []
+    for k in range(1, days + 1):
+        vals = [v for _, v in history[k:frame_len + k]]
+        pandas_out.append(float(pd.Series(vals).rolling(window).mean().iloc[-1]))
+        fsum_out.append(math.fsum(vals[-window:]) / window)
+    max_diff = max(abs(a - b) for a, b in zip(pandas_out, fsum_out))
+    mismatched = [b for a, b in zip(pandas_out, fsum_out) if round(a, 2) != round(b, 2)]
+    off_tie = sum(1 for b in mismatched if abs(b * 100 % 1 - 0.5) > 1e-6)
+    print(
+        f"{name:<28} frame={frame_len:<5} refreshes={days:<4} max_abs_diff={max_diff:.3g}  "
+        f"tie_mismatches={len(mismatched) - off_tie}  mismatches={off_tie}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=250, help="refreshes (new observations) to simulate")
+    args = parser.parse_args()
+
+    hy = _synthetic_series(2770 + args.days, 4.0, 0.06, 2.0, seed=1)
+    vix = _synthetic_series(275 + args.days, 15.0, 0.8, 9.0, seed=2)
+    bench("HY median (2520/1260)", hy, 2520, 1260, args.days, "median")
+    bench("VIX pct rank (252/126)", vix, 252, 126, args.days, "rank")
+    bench_ma("VIX MA (20), 2 decimals", vix, 20, args.days)
@@ -5,18 +5,58 @@ Reads from the EPS Momentum SQLite database and serves screening,
 portfolio, market, and analytics data via REST endpoints.
 """
 
+import asyncio
+import contextvars
+import csv
+import gzip
+import hashlib
 import io
 import json
+import math
 import os
+import queue
+import re
 import sqlite3
+import sys
+import threading
 import time
 import urllib.request
-from contextlib import contextmanager
+import weakref
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import partial, wraps
+from typing import Callable, NamedTuple, Optional
 
-from fastapi import FastAPI, HTTPException
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.routing import Match
+
+try:
+    import yfinance as yf
+except ImportError:  # indices are optional; HY/VIX still work
+    yf = None
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # /api/export and `main.py export` are unavailable
+    pa = pq = None
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -31,7 +71,500 @@ TICKER_CACHE_PATH = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "..", "..", "eps-momentum-us", "ticker_info_cache.json",
 )
 
-app = FastAPI(title="EPS Momentum Dashboard API", version="0.2.0")
+# SQLite connection pool (read-only). Sizes in bytes unless noted.
+DB_POOL_SIZE = int(os.environ.get("EPS_DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.environ.get("EPS_DB_POOL_TIMEOUT", "30"))
+DB_MMAP_SIZE = int(os.environ.get("EPS_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_CACHE_SIZE = int(os.environ.get("EPS_DB_CACHE_SIZE", "-65536"))  # negative = KiB (64 MiB)
+DB_TEMP_STORE = os.environ.get("EPS_DB_TEMP_STORE", "MEMORY")  # DEFAULT | FILE | MEMORY
+DB_STATEMENT_CACHE = int(os.environ.get("EPS_DB_STATEMENT_CACHE", "256"))
+
+# Async handlers hand blocking work to dedicated pools: SQLite work and
+# upstream network waits never share threads. *_QUEUE caps calls queued or
+# running per pool (beyond it: 503); 0 = unbounded.
+DB_EXECUTOR_WORKERS = int(os.environ.get("EPS_DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))
+DB_EXECUTOR_QUEUE = int(os.environ.get("EPS_DB_EXECUTOR_QUEUE", "256"))
+NET_EXECUTOR_WORKERS = int(os.environ.get("EPS_NET_EXECUTOR_WORKERS", "4"))
+NET_EXECUTOR_QUEUE = int(os.environ.get("EPS_NET_EXECUTOR_QUEUE", "64"))
+
+# Response compression: bodies smaller than this are sent as-is
+COMPRESS_MIN_SIZE = int(os.environ.get("EPS_COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.environ.get("EPS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("EPS_BROTLI_QUALITY", "5"))
+
+# Streaming (NDJSON / chunked JSON) history endpoints: rows per fetchmany()
+STREAM_FETCH_ROWS = int(os.environ.get("EPS_STREAM_FETCH_ROWS", "2000"))
+# Streaming bodies (history streams, exports) open at once; more get 503. 0 = unbounded
+STREAM_MAX_OPEN = int(os.environ.get("EPS_STREAM_MAX_OPEN", "16"))
+
+# Columnar export: rows fetched, enriched and written per batch
+EXPORT_BATCH_ROWS = int(os.environ.get("EPS_EXPORT_BATCH_ROWS", "50000"))
+
+# HTTP caching: max-age for immutable per-date responses (past /api/portfolio/{date})
+HTTP_PAST_MAX_AGE = int(os.environ.get("EPS_HTTP_PAST_MAX_AGE", "86400"))
+
+# Opt-in: create the covering indexes below at startup (needs write access)
+DB_CREATE_INDEXES = os.environ.get("EPS_DB_CREATE_INDEXES", "0") == "1"
+
+# In-memory response cache
+CACHE_MAX_ENTRIES = int(os.environ.get("EPS_CACHE_MAX_ENTRIES", "512"))
+# DB-derived results in the cache (keyed by DB version, so the TTL only bounds memory)
+RESULT_CACHE_TTL = int(os.environ.get("EPS_RESULT_CACHE_TTL", "3600"))
+
+# Market data background refresh (stale-while-revalidate)
+MARKET_REFRESH_SEC = float(os.environ.get("EPS_MARKET_REFRESH_SEC", "3600"))
+MARKET_REFRESHER_ENABLED = os.environ.get("EPS_MARKET_REFRESHER", "1") != "0"
+# Overall wall-clock budget for one concurrent HY/VIX/index fetch round
+MARKET_FETCH_BUDGET_SEC = float(os.environ.get("EPS_MARKET_FETCH_BUDGET_SEC", "30"))
+# Threads for the individual HY/VIX/index fetches of a round
+MARKET_FETCH_WORKERS = int(os.environ.get("EPS_MARKET_FETCH_WORKERS", "6"))
+
+# Local FRED series store (HY spread, VIX); fetches only new observations
+MARKET_STORE_PATH = os.environ.get(
+    "EPS_MARKET_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "market_store.db"),
+)
+# Days before the last stored observation re-fetched on each sync, since
+# FRED revises recent values
+FRED_OVERLAP_DAYS = int(os.environ.get("EPS_FRED_OVERLAP_DAYS", "10"))
+# Directory of <SERIES_ID>.csv files standing in for FRED (offline/tests)
+FRED_FIXTURE_DIR = os.environ.get("EPS_FRED_FIXTURE_DIR")
+
+# Market indices shown in the header: "SYMBOL:Name,SYMBOL:Name,..."
+MARKET_INDICES = [
+    tuple(item.split(":", 1))
+    for item in os.environ.get(
+        "EPS_MARKET_INDICES", "^GSPC:S&P 500,^IXIC:NASDAQ,^DJI:Dow Jones"
+    ).split(",")
+    if ":" in item
+]
+# An index whose newest cached bar is this many days behind the newest bar of
+# any index no longer sets the download start (it would pin it forever)
+INDEX_STALE_DAYS = int(os.environ.get("EPS_INDEX_STALE_DAYS", "7"))
+# Directory of <SYMBOL>.csv (date,close) files standing in for yfinance
+INDEX_FIXTURE_DIR = os.environ.get("EPS_INDEX_FIXTURE_DIR")
+
+# Precomputed per-date payload store (side SQLite file, writable)
+PAYLOAD_STORE_PATH = os.environ.get(
+    "EPS_PAYLOAD_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "payload_store.db"),
+)
+PAYLOAD_STORE_ENABLED = os.environ.get("EPS_PAYLOAD_STORE", "1") != "0"
+# Bump whenever the shape or derivation of a stored payload changes.
+PAYLOAD_SCHEMA_VERSION = 1
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run DB maintenance, then start the market-data refresher for the app's lifetime."""
+    _run_db_maintenance()
+    if MARKET_REFRESHER_ENABLED:
+        _market_refresher.start()
+    try:
+        yield
+    finally:
+        _market_refresher.stop()
+
+
+# ---------------------------------------------------------------------------
+# JSON serialization + response compression
+# ---------------------------------------------------------------------------
+
+
+# numpy scalars are float/int subclasses the stdlib encoder accepts; orjson needs the flag
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def _dump_payload(payload) -> str:
+    """Serialize like FastAPI's JSONResponse (compact, UTF-8), via orjson when installed.
+
+    orjson writes NaN/Inf as null where the stdlib encoder raises.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=_ORJSON_OPTIONS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+class _FastJSONResponse(JSONResponse):
+    """Default response class: orjson when installed, else the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=_ORJSON_OPTIONS)
+        return super().render(content)
+
+
+def _accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (q=0 excluded), else None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# Parquet / Arrow IPC exports are zstd-compressed internally
+_PRECOMPRESSED_TYPE_PREFIX = b"application/vnd.apache."
+
+
+class _StreamCompressor:
+    """Incremental gzip/brotli encoder for streamed responses."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._c.process(data) + self._c.flush()
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.finish() if self.encoding == "br" else self._c.flush()
+
+
+class _CompressionMiddleware:
+    """Negotiated br/gzip for responses of at least COMPRESS_MIN_SIZE bytes.
+
+    Responses that already carry Content-Encoding (precompressed payloads)
+    pass through untouched; streamed responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = _accepted_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message  # held until the first body chunk decides
+                return
+            if message["type"] != "http.response.body" or start is None or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if compressor is None:
+                response_headers = [(k, v) for k, v in start["headers"]]
+                names = {k.lower() for k, _ in response_headers}
+                content_type = next((v for k, v in response_headers if k.lower() == b"content-type"), b"")
+                passthrough = (
+                    b"content-encoding" in names
+                    or content_type.startswith(_PRECOMPRESSED_TYPE_PREFIX)
+                    or start["status"] in (204, 304)
+                    or (not more and len(body) < self.minimum_size)
+                )
+                if passthrough:
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _StreamCompressor(encoding)
+                response_headers = [(k, v) for k, v in response_headers if k.lower() != b"content-length"]
+                response_headers.append((b"content-encoding", encoding.encode("ascii")))
+                vary = [v for k, v in response_headers if k.lower() == b"vary"]
+                if not vary:
+                    response_headers.append((b"vary", b"Accept-Encoding"))
+                elif b"accept-encoding" not in vary[0].lower():
+                    response_headers = [(k, v) for k, v in response_headers if k.lower() != b"vary"]
+                    response_headers.append((b"vary", vary[0] + b", Accept-Encoding"))
+                if not more:
+                    payload = _compress(body, encoding)
+                    response_headers.append((b"content-length", str(len(payload)).encode("ascii")))
+                    await send({**start, "headers": response_headers})
+                    await send({"type": "http.response.body", "body": payload})
+                    return
+                await send({**start, "headers": response_headers})
+
+            data = compressor.chunk(body) if body else b""
+            if not more:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
+
+
+# ---------------------------------------------------------------------------
+# Metrics (Prometheus text exposition at /api/metrics)
+# ---------------------------------------------------------------------------
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_SIZE_BUCKETS = tuple(float(256 * 4 ** i) for i in range(9))  # 256 B .. 16 MiB
+_QUERY_COUNT_BUCKETS = (0.0, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+_UPSTREAM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0)
+
+
+def _prom_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _prom_value(value) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Metrics:
+    """Process-wide counters and fixed-bucket histograms in Prometheus text format.
+
+    Series are keyed by metric name plus a tuple of (label, value) pairs.
+    Metrics are declared once, up front; inc()/observe() take one short lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: dict[str, tuple[str, str, tuple]] = {}  # name -> (type, help, buckets)
+        self._series: dict[str, dict[tuple, object]] = {}
+
+    def counter(self, name: str, help_: str):
+        self._meta[name] = ("counter", help_, ())
+        self._series[name] = {}
+
+    def histogram(self, name: str, help_: str, buckets: tuple):
+        self._meta[name] = ("histogram", help_, tuple(sorted(buckets)))
+        self._series[name] = {}
+
+    def inc(self, name: str, labels: tuple = (), value=1):
+        with self._lock:
+            series = self._series[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def observe(self, name: str, value: float, labels: tuple = ()):
+        buckets = self._meta[name][2]
+        i = bisect_left(buckets, value)  # first bucket with le >= value; len(buckets) = +Inf
+        with self._lock:
+            hist = self._series[name].get(labels)
+            if hist is None:
+                # per-bucket counts (last one is +Inf), then the sum
+                hist = self._series[name][labels] = [0] * (len(buckets) + 1) + [0.0]
+            hist[i] += 1
+            hist[-1] += value
+
+    def render(self, collected: tuple = ()) -> str:
+        """Exposition text, plus *collected* (name, type, help, [(labels, value), ...]) read at scrape time."""
+        with self._lock:
+            series = {name: {k: (list(v) if isinstance(v, list) else v) for k, v in s.items()}
+                      for name, s in self._series.items()}
+        out = []
+        for name, (kind, help_, buckets) in self._meta.items():
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series[name].items()):
+                if kind == "counter":
+                    out.append(f"{name}{_prom_labels(labels)} {_prom_value(value)}")
+                    continue
+                cumulative = 0
+                for le, count in zip(buckets + ("+Inf",), value):
+                    cumulative += count
+                    le = le if isinstance(le, str) else repr(le)
+                    out.append(f"{name}_bucket{_prom_labels(labels + (('le', le),))} {cumulative}")
+                out.append(f"{name}_sum{_prom_labels(labels)} {_prom_value(value[-1])}")
+                out.append(f"{name}_count{_prom_labels(labels)} {cumulative}")
+        for name, kind, help_, samples in collected:
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                out.append(f"{name}{_prom_labels(labels)} {_prom_value(value)}")
+        return "\n".join(out) + "\n"
+
+
+_metrics = _Metrics()
+_metrics.counter("eps_http_requests_total", "HTTP requests by method, route template and status.")
+_metrics.histogram("eps_http_request_duration_seconds", "Request latency, first byte in to last byte out.",
+                   _LATENCY_BUCKETS)
+_metrics.histogram("eps_http_response_size_bytes", "Response body bytes on the wire (after compression).",
+                   _SIZE_BUCKETS)
+_metrics.histogram("eps_http_request_db_queries", "SQLite statements executed per request.", _QUERY_COUNT_BUCKETS)
+_metrics.histogram("eps_http_request_db_seconds", "Time per request spent in SQLite execute/fetch calls.",
+                   _LATENCY_BUCKETS)
+_metrics.histogram("eps_upstream_fetch_seconds", "Duration of each FRED / yfinance fetch.", _UPSTREAM_BUCKETS)
+_metrics.counter("eps_upstream_fetch_failures_total", "FRED / yfinance fetches that raised or returned nothing.")
+
+# [statements, seconds] of SQLite work for the current request; None outside requests
+_request_db_usage: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("_request_db_usage", default=None)
+
+
+def _charge_db(started: float, statements: int = 0):
+    usage = _request_db_usage.get()
+    if usage is not None:
+        usage[0] += statements
+        usage[1] += time.perf_counter() - started
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Cursor that charges execute and fetch time to the current request."""
+
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            _charge_db(started, 1)
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            _charge_db(started, 1)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _charge_db(started)
+
+    def fetchmany(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(*args)
+        finally:
+            _charge_db(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _charge_db(started)
+
+
+class _TimedConnection(sqlite3.Connection):
+    """Connection whose cursors are _TimedCursor (Connection.execute bypasses cursor(), so route it)."""
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+
+@contextmanager
+def _upstream_fetch(source: str, series: str):
+    """Time one FRED / yfinance fetch; an exception counts as a failure. Yields the labels."""
+    labels = (("source", source), ("series", series))
+    started = time.perf_counter()
+    try:
+        yield labels
+    except BaseException:
+        _metrics.inc("eps_upstream_fetch_failures_total", labels)
+        raise
+    finally:
+        _metrics.observe("eps_upstream_fetch_seconds", time.perf_counter() - started, labels)
+
+
+class _MetricsMiddleware:
+    """Per-request count, latency, wire size and SQLite usage, labelled by route template.
+
+    Installed outermost, so 304s and compressed bodies are measured as sent.
+    Requests that match no route are labelled "unmatched".
+    """
+
+    TEMPLATE_CACHE_MAX = 1024
+
+    def __init__(self, app):
+        self.app = app
+        # (method, path) -> template for requests answered before routing;
+        # only touched from the event loop, so unlocked
+        self._templates: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+    def _route_template(self, app, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return getattr(route, "path", None) or "unmatched"
+        # Answered before routing (e.g. a 304 from conditional_get) or no
+        # route at all: scan the routes once per distinct path
+        key = (scope["method"], scope["path"])
+        template = self._templates.get(key)
+        if template is None:
+            route = next((r for r in app.router.routes if r.matches(scope)[0] == Match.FULL), None)
+            template = getattr(route, "path", None) or "unmatched"
+            self._templates[key] = template
+            if len(self._templates) > self.TEMPLATE_CACHE_MAX:
+                self._templates.popitem(last=False)
+        else:
+            self._templates.move_to_end(key)
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        usage = [0, 0.0]
+        token = _request_db_usage.set(usage)
+        status, size = 500, 0
+
+        async def send_counted(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            _request_db_usage.reset(token)
+            route = self._route_template(scope["app"], scope) if "app" in scope else "unmatched"
+            labels = (("method", scope["method"]), ("route", route))
+            _metrics.inc("eps_http_requests_total", labels + (("status", str(status)),))
+            _metrics.observe("eps_http_request_duration_seconds", time.perf_counter() - started, labels)
+            _metrics.observe("eps_http_response_size_bytes", size, labels)
+            _metrics.observe("eps_http_request_db_queries", usage[0], labels)
+            _metrics.observe("eps_http_request_db_seconds", usage[1], labels)
+
+
+app = FastAPI(
+    title="EPS Momentum Dashboard API",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=_FastJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -40,6 +573,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(_CompressionMiddleware)
 
 # ---------------------------------------------------------------------------
 # INDUSTRY_MAP  (copied from eps_momentum_system.py)
@@ -194,48 +728,236 @@ INDUSTRY_MAP = {
 INDUSTRY_KR_TO_EN = {v: k for k, v in INDUSTRY_MAP.items()}
 
 # ---------------------------------------------------------------------------
-# Load ticker_info_cache.json at startup
+# Ticker info index (ticker_info_cache.json, hot-reloaded)
 # ---------------------------------------------------------------------------
 
-TICKER_CACHE: dict[str, dict] = {}
+_UNKNOWN_INDUSTRY_KR = "기타"
+_UNKNOWN_INDUSTRY_EN = INDUSTRY_KR_TO_EN.get(_UNKNOWN_INDUSTRY_KR, "N/A")
 
-def _load_ticker_cache():
-    global TICKER_CACHE
-    try:
-        with open(TICKER_CACHE_PATH, 'r', encoding='utf-8') as f:
-            TICKER_CACHE = json.load(f)
-    except Exception:
-        TICKER_CACHE = {}
 
-_load_ticker_cache()
+class _TickerInfo(NamedTuple):
+    """Display fields for one ticker; shared between requests, never mutated."""
+    short_name: str
+    industry_kr: str
+    industry_en: str
 
 
-def _get_ticker_info(ticker: str) -> dict:
-    """Return {shortName, industry_kr, industry_en} for a ticker."""
-    info = TICKER_CACHE.get(ticker, {})
-    industry_kr = info.get("industry", "기타")
-    industry_en = INDUSTRY_KR_TO_EN.get(industry_kr, "N/A")
-    return {
-        "short_name": info.get("shortName", ticker),
-        "industry_kr": industry_kr,
-        "industry_en": industry_en,
-    }
+class _TickerInfoIndex:
+    """ticker_info_cache.json as a dict of immutable _TickerInfo records.
+
+    The file is re-read whenever its (inode, mtime, size) changes, so the
+    upstream job's updates show up without a restart. Only the display
+    fields are kept, industry names are interned and industry_en is resolved
+    once per load. A reload builds a new dict and swaps it in with one
+    assignment: readers never wait on a refresh, they keep the previous index
+    while another thread parses. Only the first load blocks, so no caller
+    ever sees an empty index just because it is still loading. An
+    unreadable file keeps the previous index.
+    """
+
+    _UNLOADED = object()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._state: tuple = (self._UNLOADED, {})  # (file stamp, ticker -> _TickerInfo)
+        self._lock = threading.Lock()
+        self.stats = {"reloads": 0, "errors": 0}
+
+    def _stamp(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load(self, previous: dict) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            records = {}
+            for ticker, info in raw.items():
+                if not isinstance(info, dict):
+                    continue
+                industry_kr = info.get("industry", _UNKNOWN_INDUSTRY_KR)
+                if isinstance(industry_kr, str):
+                    industry_kr = sys.intern(industry_kr)
+                records[ticker] = _TickerInfo(
+                    info.get("shortName", ticker),
+                    industry_kr,
+                    INDUSTRY_KR_TO_EN.get(industry_kr, "N/A"),
+                )
+        except Exception:
+            self.stats["errors"] += 1
+            return previous
+        self.stats["reloads"] += 1
+        return records
+
+    def _current(self) -> dict:
+        stamp, records = self._state
+        new_stamp = self._stamp()
+        if new_stamp == stamp:
+            return records
+        if stamp is self._UNLOADED:
+            self._lock.acquire()  # first load: wait for real records
+        elif not self._lock.acquire(blocking=False):
+            return records  # refresh in progress elsewhere: serve the previous index
+        try:
+            stamp, records = self._state
+            if new_stamp != stamp:
+                records = self._load(records) if new_stamp is not None else {}
+                self._state = (new_stamp, records)
+        finally:
+            self._lock.release()
+        return records
+
+    def version(self) -> str:
+        """Identity of the loaded file (inode-mtime-size), "none" without one.
+
+        Part of every key that caches output embedding ticker info (stored
+        payloads, ETags, cached() results), so a reload invalidates them.
+        """
+        self._current()
+        stamp = self._state[0]
+        return "-".join(str(v) for v in stamp) if stamp else "none"
+
+    def resolver(self) -> Callable[[str], _TickerInfo]:
+        """A ticker -> _TickerInfo lookup bound to the current index version.
+
+        One file check when created, none per lookup: for per-row use over
+        a whole request.
+        """
+        records = self._current()
+
+        def lookup(ticker: str) -> _TickerInfo:
+            info = records.get(ticker)
+            if info is None:
+                return _TickerInfo(ticker, _UNKNOWN_INDUSTRY_KR, _UNKNOWN_INDUSTRY_EN)
+            return info
+
+        return lookup
+
+    def get(self, ticker: str) -> _TickerInfo:
+        return self.resolver()(ticker)
+
+    def get_many(self, tickers) -> dict[str, _TickerInfo]:
+        """Records for every ticker in *tickers* against one index version."""
+        lookup = self.resolver()
+        return {t: lookup(t) for t in tickers}
+
+    def snapshot(self) -> dict:
+        return {"count": len(self._current()), **self.stats}
+
+
+_ticker_info = _TickerInfoIndex(TICKER_CACHE_PATH)
 
 
 # ---------------------------------------------------------------------------
-# Simple in-memory cache with TTL
+# In-memory LRU cache with per-key TTL
 # ---------------------------------------------------------------------------
 
-_cache: dict[str, dict] = {}
+
+class _TTLCache:
+    """Bounded, thread-safe LRU cache with per-key TTL and single-flight fills.
+
+    Concurrent misses on the same key wait on a per-key lock, so only one
+    caller runs the (possibly slow) compute function; the rest reuse its
+    result. A per-key lock lives only while some caller holds or waits on
+    it, so the lock table stays as small as the set of in-flight keys.
+    Counters are exposed via /api/health.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        # key -> [lock, callers holding or waiting on it]; dropped when the count reaches 0
+        self._inflight: dict[str, list] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "expirations": 0}
+
+    def _lookup(self, key: str) -> tuple[bool, object]:
+        # Caller holds self._lock
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            self.stats["expirations"] += 1
+            return False, None
+        self._data.move_to_end(key)
+        return True, entry[1]
+
+    def _evict(self):
+        # Caller holds self._lock. Drop expired entries first, then LRU.
+        now = time.monotonic()
+        for k in [k for k, (exp, _) in self._data.items() if exp <= now]:
+            del self._data[k]
+            self.stats["expirations"] += 1
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_or_compute(self, key: str, ttl_seconds: float, fn):
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                self.stats["hits"] += 1
+                return value
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = [threading.Lock(), 0]
+            inflight[1] += 1
+
+        try:
+            with inflight[0]:
+                with self._lock:
+                    hit, value = self._lookup(key)
+                    if hit:
+                        # Filled by a concurrent caller while we waited
+                        self.stats["coalesced"] += 1
+                        return value
+                    self.stats["misses"] += 1
+                value = fn()
+                with self._lock:
+                    self._data[key] = (time.monotonic() + ttl_seconds, value)
+                    self._data.move_to_end(key)
+                    if len(self._data) > self.max_entries:
+                        self._evict()
+                return value
+        finally:
+            with self._lock:
+                inflight[1] -= 1
+                if inflight[1] == 0:
+                    del self._inflight[key]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one key, or everything when *key* is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._data)
+            inflight = len(self._inflight)
+        lookups = stats["hits"] + stats["coalesced"] + stats["misses"]
+        return {
+            "entries": size,
+            "inflight": inflight,
+            "max_entries": self.max_entries,
+            "hit_rate": round((stats["hits"] + stats["coalesced"]) / lookups, 4) if lookups else None,
+            **stats,
+        }
+
+
+_cache = _TTLCache(CACHE_MAX_ENTRIES)
 
 
 def cached(key: str, ttl_seconds: int, fn):
-    """Return cached result or call fn() and cache it."""
-    if key in _cache and time.time() - _cache[key]["ts"] < ttl_seconds:
-        return _cache[key]["data"]
-    data = fn()
-    _cache[key] = {"data": data, "ts": time.time()}
-    return data
+    """Return cached result or call fn() and cache it (single-flight per key)."""
+    return _cache.get_or_compute(key, ttl_seconds, fn)
 
 
 # ---------------------------------------------------------------------------
@@ -243,15 +965,252 @@ def cached(key: str, ttl_seconds: int, fn):
 # ---------------------------------------------------------------------------
 
 
+class _ConnectionPool:
+    """Bounded pool of read-only, pragma-tuned sqlite3 connections.
+
+    Connections are opened with ``mode=ro`` + ``PRAGMA query_only`` and reused
+    across requests so the page cache, mmap and parsed schema survive.
+    Each connection keeps its own prepared-statement cache
+    (``cached_statements``). Every connection is tagged with the file
+    identity (device, inode, mtime) it was opened against and the pool
+    generation; when the file is replaced or rewritten, idle connections are
+    dropped and in-use ones are closed on release instead of going back
+    into the pool, so no checkout keeps reading the old file.
+    """
+
+    def __init__(self, path: str, max_size: int, timeout: float):
+        self.path = path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open_count = 0
+        self._file_id = None
+        self._generation = 0  # bumped by clear(); older connections are retired on release
+        self.stats = {
+            "opened": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "invalidations": 0,
+            "retired": 0,
+        }
+
+    def _bump(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _current_file_id(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Stat before opening: if the file changes in between, the tag is stale and the connection retired
+        file_id = self._current_file_id()
+        with self._lock:
+            generation = self._generation
+        uri = "file:" + os.path.abspath(self.path).replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=DB_STATEMENT_CACHE,
+            factory=_TimedConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = 1")
+        conn.execute(f"PRAGMA mmap_size = {int(DB_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size = {int(DB_CACHE_SIZE)}")
+        conn.execute(f"PRAGMA temp_store = {DB_TEMP_STORE}")
+        conn.pool_tag = (generation, file_id)
+        self._bump("opened")
+        return conn
+
+    def open_unpooled(self) -> sqlite3.Connection:
+        """A tuned read-only connection outside the pool (caller closes it).
+
+        For work that may run while the caller already holds a pooled
+        connection, so it can never deadlock on an exhausted pool.
+        """
+        return self._connect()
+
+    def _close(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open_count -= 1
+            self.stats["closed"] += 1
+
+    def _check_file(self) -> tuple:
+        """Retire every connection if the DB file was swapped or rewritten. Returns the current tag."""
+        file_id = self._current_file_id()
+        with self._lock:
+            changed = file_id != self._file_id and self._file_id is not None
+            self._file_id = file_id
+        if changed:
+            self._bump("invalidations")
+            self.clear()
+        with self._lock:
+            return (self._generation, file_id)
+
+    def _is_current(self, conn: sqlite3.Connection, tag: tuple) -> bool:
+        return getattr(conn, "pool_tag", None) == tag
+
+    def _retire(self, conn: sqlite3.Connection):
+        self._bump("retired")
+        self._close(conn)
+
+    def acquire(self) -> sqlite3.Connection:
+        tag = self._check_file()
+        self._bump("checkouts")
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_current(conn, tag):
+                self._bump("reused")
+                return conn
+            self._retire(conn)
+
+        with self._lock:
+            can_open = self._open_count < self.max_size
+            if can_open:
+                self._open_count += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._open_count -= 1
+                self._bump("errors")
+                raise
+
+        self._bump("waits")
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            self._bump("timeouts")
+            raise HTTPException(status_code=503, detail="Database pool exhausted")
+        if not self._is_current(conn, tag):
+            # Opened against the old file; replace it with a fresh one in its slot
+            self._retire(conn)
+            with self._lock:
+                self._open_count += 1
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._open_count -= 1
+                self._bump("errors")
+                raise
+        self._bump("reused")
+        return conn
+
+    def release(self, conn: sqlite3.Connection, broken: bool = False):
+        if broken:
+            self._bump("errors")
+            self._close(conn)
+            return
+        file_id = self._current_file_id()
+        with self._lock:
+            tag = (self._generation, file_id)
+        if not self._is_current(conn, tag):
+            # Checked out across a file swap or clear(): never hand it out again
+            self._retire(conn)
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def clear(self):
+        """Close every idle connection and retire in-use ones: they are closed on release."""
+        with self._lock:
+            self._generation += 1
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(conn)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            open_count = self._open_count
+            stats = dict(self.stats)
+        idle = self._idle.qsize()
+        return {
+            "max_size": self.max_size,
+            "open": open_count,
+            "idle": idle,
+            "in_use": open_count - idle,
+            **stats,
+        }
+
+
+_db_pool = _ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT)
+
+
 @contextmanager
 def get_db():
-    """Yield a sqlite3 connection with row_factory set."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Yield a pooled read-only sqlite3 connection with row_factory set."""
+    conn = _db_pool.acquire()
+    broken = False
     try:
         yield conn
+    except sqlite3.DatabaseError:
+        broken = True
+        raise
     finally:
-        conn.close()
+        _db_pool.release(conn, broken=broken)
+
+
+@contextmanager
+def _use_db(conn=None):
+    """Yield *conn* when a caller shares one (e.g. the dashboard bundle), else a pooled one."""
+    if conn is not None:
+        yield conn
+    else:
+        with get_db() as pooled:
+            yield pooled
+
+
+def _db_file_version() -> Optional[tuple]:
+    """Cheap change token for the DB: (mtime_ns, size) of the main file and its WAL.
+
+    Changes whenever the upstream job commits (WAL or rollback journal) or
+    replaces the file; None if the DB file is missing.
+    """
+    try:
+        st = os.stat(DB_PATH)
+    except OSError:
+        return None
+    try:
+        wal = os.stat(DB_PATH + "-wal")
+        wal_id = (wal.st_mtime_ns, wal.st_size)
+    except OSError:
+        wal_id = None
+    return (st.st_ino, st.st_mtime_ns, st.st_size, wal_id)
+
+
+def _date_range_where(start: Optional[str], end: Optional[str]) -> tuple[list[str], list]:
+    """WHERE terms + params for an inclusive [start, end] range on ``date`` (either may be None)."""
+    where, params = [], []
+    if start:
+        where.append("date >= ?")
+        params.append(start)
+    if end:
+        where.append("date <= ?")
+        params.append(end)
+    return where, params
 
 
 def rows_to_dicts(rows):
@@ -259,10 +1218,191 @@ def rows_to_dicts(rows):
     return [dict(r) for r in rows]
 
 
-def _get_columns(conn, table: str) -> set[str]:
-    """Return the set of column names for a table."""
-    cur = conn.execute(f"PRAGMA table_info({table})")
-    return {r["name"] for r in cur.fetchall()}
+class _SchemaRegistry:
+    """Tables and columns of the screening DB, introspected once per schema version.
+
+    Every lookup first reads ``PRAGMA schema_version`` (a header field, no
+    table access); sqlite_master and PRAGMA table_info are re-read only
+    when it — or the DB file's inode — changes. SQL strings built from
+    the registry are memoized under a name until the next schema change,
+    least recently used first out beyond *max_sql* (the per-connection
+    statement cache could not hold more anyway).
+    """
+
+    def __init__(self, max_sql: int = DB_STATEMENT_CACHE):
+        self._lock = threading.Lock()
+        self._key = None
+        self._tables: dict[str, list[tuple[str, str]]] = {}  # table -> [(column, declared type)]
+        self._columns: dict[str, frozenset] = {}
+        self._sql: OrderedDict[str, str] = OrderedDict()
+        self._max_sql = max(1, max_sql)
+        self.stats = {"introspections": 0, "sql_compiled": 0, "sql_hits": 0}
+
+    def _refresh(self, conn):
+        """Re-introspect if *conn* sees a new schema; returns the schema key it saw."""
+        version = _db_file_version()
+        key = (version[0] if version else None, conn.execute("PRAGMA schema_version").fetchone()[0])
+        if key == self._key:
+            return key
+        with self._lock:
+            if key == self._key:
+                return key
+            tables = {}
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                tables[name] = [(r[1], r[2] or "") for r in conn.execute(f"PRAGMA table_info({name})")]
+            self._tables = tables
+            self._columns = {t: frozenset(c for c, _ in cols) for t, cols in tables.items()}
+            self._sql = OrderedDict()
+            self._key = key
+            self.stats["introspections"] += 1
+        return key
+
+    def columns(self, conn, table: str) -> frozenset:
+        """Column names of *table* (empty if the table does not exist)."""
+        self._refresh(conn)
+        return self._columns.get(table, frozenset())
+
+    def column_types(self, conn, table: str) -> list[tuple[str, str]]:
+        """[(column, declared type)] of *table* in table order."""
+        self._refresh(conn)
+        return list(self._tables.get(table, []))
+
+    def present(self, conn, table: str, names: list[str]) -> list[str]:
+        """The subset of *names* that *table* has, in the given order."""
+        cols = self.columns(conn, table)
+        return [n for n in names if n in cols]
+
+    def has_table(self, conn, table: str) -> bool:
+        self._refresh(conn)
+        return table in self._tables
+
+    def sql(self, conn, name: str, build: Callable[[], str]) -> str:
+        """SQL string *name*, built by *build()* once per schema version."""
+        key = self._refresh(conn)
+        with self._lock:
+            sql = self._sql.get(name)
+            if sql is not None:
+                self._sql.move_to_end(name)
+                self.stats["sql_hits"] += 1
+                return sql
+        sql = build()
+        with self._lock:
+            self.stats["sql_compiled"] += 1
+            # Built unlocked: don't file it under a schema that changed meanwhile
+            if key == self._key:
+                self._sql[name] = sql
+                while len(self._sql) > self._max_sql:
+                    self._sql.popitem(last=False)
+        return sql
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "schema_version": self._key[1] if self._key else None,
+                "tables": sorted(self._tables),
+                "cached_sql": len(self._sql),
+                **self.stats,
+            }
+
+
+_schema = _SchemaRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Index migration + query-plan verification (startup)
+# ---------------------------------------------------------------------------
+
+# (index name, table, columns, required column or None)
+_INDEXES = [
+    ("idx_ntm_date_part2", "ntm_screening", "date, part2_rank", None),
+    ("idx_ntm_ticker_date", "ntm_screening", "ticker, date", None),
+    ("idx_ntm_date_composite", "ntm_screening", "date, composite_rank", "composite_rank"),
+    ("idx_portfolio_date", "portfolio_log", "date, ticker", None),
+    ("idx_portfolio_action_date", "portfolio_log", "action, date", None),
+]
+
+# Representative shapes of the hot handler queries; parameters are dummies.
+_HOT_QUERIES = [
+    ("dates",
+     "SELECT DISTINCT date FROM ntm_screening WHERE part2_rank IS NOT NULL ORDER BY date DESC", ()),
+    ("prev_part2_date",
+     "SELECT DISTINCT date FROM ntm_screening WHERE part2_rank IS NOT NULL AND date < ? "
+     "ORDER BY date DESC LIMIT 1", ("",)),
+    ("screening_top30",
+     "SELECT ticker FROM ntm_screening WHERE date = ? AND part2_rank IS NOT NULL "
+     "ORDER BY part2_rank ASC", ("",)),
+    ("stats_count",
+     "SELECT COUNT(*) FROM ntm_screening WHERE date = ? AND adj_score > 9", ("",)),
+    ("rank_context",
+     "SELECT ticker, date, composite_rank FROM ntm_screening "
+     "WHERE date IN (?, ?, ?) AND ticker IN (?, ?)", ("", "", "", "", "")),
+    ("ticker_history",
+     "SELECT date, price FROM ntm_screening WHERE ticker = ? ORDER BY date", ("",)),
+    ("exited_antijoin",
+     "SELECT p.ticker, t.composite_rank FROM ntm_screening p "
+     "LEFT JOIN ntm_screening t ON t.ticker = p.ticker AND t.date = ? "
+     "WHERE p.date = ? AND p.part2_rank IS NOT NULL AND t.part2_rank IS NULL", ("", "")),
+    ("portfolio_date",
+     "SELECT ticker, action FROM portfolio_log WHERE date = ? ORDER BY ticker", ("",)),
+    ("portfolio_exits",
+     "SELECT ticker, return_pct FROM portfolio_log "
+     "WHERE action = 'exit' AND return_pct IS NOT NULL ORDER BY date", ()),
+]
+
+_db_maintenance: dict = {}
+
+
+def _ensure_indexes() -> list[str]:
+    """CREATE INDEX IF NOT EXISTS for _INDEXES on a short-lived writable connection."""
+    created = []
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        existing = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for name, table, columns, needs in _INDEXES:
+            if name in existing:
+                continue
+            table_cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+            if not table_cols or (needs and needs not in table_cols):
+                continue
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+            created.append(name)
+        if created:
+            conn.execute("PRAGMA optimize")
+        conn.commit()
+    finally:
+        conn.close()
+    return created
+
+
+def _explain_hot_queries(conn) -> dict:
+    """EXPLAIN QUERY PLAN every hot query; flag plans that scan a table without an index."""
+    report = {}
+    for name, sql, params in _HOT_QUERIES:
+        try:
+            plan = [r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        except sqlite3.Error as e:
+            report[name] = {"plan": [], "full_scan": None, "error": str(e)}
+            continue
+        full_scan = any(d.startswith("SCAN ") and "INDEX" not in d for d in plan)
+        report[name] = {"plan": plan, "full_scan": full_scan}
+    return report
+
+
+def _run_db_maintenance():
+    """Startup step: optional index migration, then query-plan verification."""
+    result = {"checked_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"), "indexes_created": []}
+    try:
+        if DB_CREATE_INDEXES:
+            result["indexes_created"] = _ensure_indexes()
+        with get_db() as conn:
+            queries = _explain_hot_queries(conn)
+        result["queries"] = queries
+        result["full_scans"] = [name for name, q in queries.items() if q["full_scan"]]
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    _db_maintenance.clear()
+    _db_maintenance.update(result)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -270,42 +1410,218 @@ def _get_columns(conn, table: str) -> set[str]:
 # ---------------------------------------------------------------------------
 
 
-def calc_segments(ntm_current, ntm_7d, ntm_30d, ntm_60d, ntm_90d):
-    """4 independent segment change rates, capped +/-100%."""
-    def pct(new, old):
-        if old is None or old == 0:
-            return 0.0
-        return max(-100.0, min(100.0, ((new - old) / abs(old)) * 100))
-
-    seg1 = pct(ntm_current, ntm_7d)    # 7d -> today
-    seg2 = pct(ntm_7d, ntm_30d)        # 30d -> 7d
-    seg3 = pct(ntm_30d, ntm_60d)       # 60d -> 30d
-    seg4 = pct(ntm_60d, ntm_90d)       # 90d -> 60d
-    return seg1, seg2, seg3, seg4
-
-
-def trend_icon(pct_val: float) -> str:
-    if pct_val > 20:
-        return "\U0001f525"     # fire
-    elif pct_val >= 5:
-        return "\u2600\ufe0f"   # sun
-    elif pct_val >= 1:
-        return "\U0001f324\ufe0f"  # sun behind cloud
-    elif pct_val >= -1:
-        return "\u2601\ufe0f"   # cloud
-    else:
-        return "\U0001f327\ufe0f"  # rain
+# ---------------------------------------------------------------------------
+# Columnar enrichment (segments, trend, EPS change, fwd P/E, risk flags)
+# ---------------------------------------------------------------------------
 
+# Trend icon per segment, high -> low: >20 fire, >=5 sun, >=1 sun/cloud, >=-1 cloud, else rain
+_TREND_ICONS = np.array([
+    "\U0001f525",               # fire
+    "\u2600\ufe0f",             # sun
+    "\U0001f324\ufe0f",         # sun behind cloud
+    "\u2601\ufe0f",             # cloud
+    "\U0001f327\ufe0f",         # rain
+], dtype=object)
 
-def _get_last_n_part2_dates(conn, n: int = 3) -> list[str]:
-    """Return the last *n* distinct dates that have part2_rank data, newest first."""
-    cur = conn.execute(
-        "SELECT DISTINCT date FROM ntm_screening "
-        "WHERE part2_rank IS NOT NULL "
-        "ORDER BY date DESC LIMIT ?",
-        (n,),
+
+def _column(rows: list[dict], key: str) -> np.ndarray:
+    """float64 column of *key*; missing/None -> NaN."""
+    return np.array([r.get(key) for r in rows], dtype=np.float64)
+
+
+def _rounded(values: np.ndarray, digits: int, valid: Optional[np.ndarray] = None) -> list:
+    """Python floats rounded to *digits*; None where not *valid*.
+
+    Uses builtin round() (correctly rounded) rather than np.round(), which
+    scales first and can differ in the last digit at half-way values.
+    """
+    if valid is None:
+        return [round(v, digits) for v in values.tolist()]
+    return [round(v, digits) if ok else None for v, ok in zip(values.tolist(), valid.tolist())]
+
+
+def _segment_pct(new: np.ndarray, old: np.ndarray) -> np.ndarray:
+    """Change rate old -> new in percent, capped +/-100%; 0 where old is 0."""
+    nonzero = old != 0
+    pct = np.divide(new - old, np.abs(old), out=np.zeros_like(new), where=nonzero) * 100
+    return np.clip(pct, -100.0, 100.0)
+
+
+def _trend_codes(seg: np.ndarray) -> np.ndarray:
+    return np.select([seg > 20, seg >= 5, seg >= 1, seg >= -1], [0, 1, 2, 3], default=4)
+
+
+def _enrich_columns(rows: list[dict]) -> dict[str, list]:
+    """Derived screening metrics for *rows* in one vectorized pass.
+
+    Reads ntm_current/7d/30d/60d/90d, price, rev_up30/rev_down30,
+    num_analysts and rev_growth (missing or NULL counts as 0, rev_growth
+    stays NULL). Returns per-row columns aligned with *rows*:
+    seg1..seg4 (rounded), trend (seg4 -> seg1 = past -> present),
+    eps_change_90d, fwd_pe, rev_growth (percent) and risk_flags.
+    """
+    if not rows:
+        return {k: [] for k in ("seg1", "seg2", "seg3", "seg4", "trend", "eps_change_90d",
+                                "fwd_pe", "rev_growth", "risk_flags")}
+
+    def filled(key):
+        return np.nan_to_num(_column(rows, key), nan=0.0)
+
+    ntm_c, ntm_7, ntm_30, ntm_60, ntm_90 = (
+        filled(k) for k in ("ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d")
     )
-    return [r["date"] for r in cur.fetchall()]
+    price = filled("price")
+    rev_up = filled("rev_up30")
+    rev_down = filled("rev_down30")
+    num_analysts = filled("num_analysts")
+    rev_growth = _column(rows, "rev_growth")
+
+    seg1 = _segment_pct(ntm_c, ntm_7)     # 7d -> today
+    seg2 = _segment_pct(ntm_7, ntm_30)    # 30d -> 7d
+    seg3 = _segment_pct(ntm_30, ntm_60)   # 60d -> 30d
+    seg4 = _segment_pct(ntm_60, ntm_90)   # 90d -> 60d
+    trend = (
+        _TREND_ICONS[_trend_codes(seg4)] + _TREND_ICONS[_trend_codes(seg3)]
+        + _TREND_ICONS[_trend_codes(seg2)] + _TREND_ICONS[_trend_codes(seg1)]
+    )
+
+    has_90d = ntm_90 != 0
+    eps_change_90d = np.divide(ntm_c - ntm_90, np.abs(ntm_90), out=np.zeros_like(ntm_c), where=has_90d) * 100
+    has_eps = ntm_c > 0
+    fwd_pe = np.divide(price, ntm_c, out=np.zeros_like(price), where=has_eps)
+
+    # Risk flags: masks are vectorized; dicts are built only for flagged rows
+    total_rev = rev_up + rev_down
+    down_ratio = np.divide(rev_down, total_rev, out=np.zeros_like(total_rev), where=total_rev > 0)
+    downgrade = down_ratio > 0.3
+    low_coverage = num_analysts < 3
+    high_pe = has_eps & (fwd_pe > 100)
+    risk_flags: list[list[dict]] = [[] for _ in rows]
+    for i in np.flatnonzero(downgrade | low_coverage | high_pe).tolist():
+        row = rows[i]
+        flags = risk_flags[i]
+        if downgrade[i]:
+            down = row.get("rev_down30") or 0
+            total = (row.get("rev_up30") or 0) + down
+            flags.append({
+                "type": "revenue_downgrade",
+                "label": "하향",
+                "detail": f"하향 {down}/{total} ({down/total*100:.0f}%)",
+            })
+        if low_coverage[i]:
+            flags.append({
+                "type": "low_coverage",
+                "label": "저커버리지",
+                "detail": f"애널리스트 {row.get('num_analysts') or 0}명",
+            })
+        if high_pe[i]:
+            flags.append({
+                "type": "high_pe",
+                "label": "고평가",
+                "detail": f"Fwd P/E {fwd_pe[i]:.1f}x",
+            })
+
+    return {
+        "seg1": _rounded(seg1, 2),
+        "seg2": _rounded(seg2, 2),
+        "seg3": _rounded(seg3, 2),
+        "seg4": _rounded(seg4, 2),
+        "trend": trend.tolist(),
+        "eps_change_90d": _rounded(eps_change_90d, 2, has_90d),
+        "fwd_pe": _rounded(fwd_pe, 2, has_eps),
+        "rev_growth": _rounded(rev_growth * 100, 1, ~np.isnan(rev_growth)),
+        "risk_flags": risk_flags,
+    }
+
+
+class _DateIndex:
+    """Sorted in-memory index of dates that have part2_rank data.
+
+    Rebuilt (one DISTINCT scan) only when _db_file_version() changes; every
+    lookup is then a bisection over the ascending date list. A rebuild
+    swaps in a new list, so readers never block on it.
+    """
+
+    def __init__(self):
+        self._dates: list[str] = []  # ascending
+        self._desc: list[str] = []   # the same dates, newest first
+        self._version = object()     # never equals a real version
+        self._lock = threading.Lock()
+        self.stats = {"rebuilds": 0}
+
+    def _current(self) -> list[str]:
+        version = _db_file_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    # Callers may hold a pooled connection already
+                    conn = _db_pool.open_unpooled()
+                    try:
+                        cur = conn.execute(
+                            "SELECT DISTINCT date FROM ntm_screening "
+                            "WHERE part2_rank IS NOT NULL "
+                            "ORDER BY date ASC"
+                        )
+                        dates = [r["date"] for r in cur.fetchall()]
+                    finally:
+                        conn.close()
+                    self._dates, self._desc = dates, dates[::-1]
+                    self._version = version
+                    self.stats["rebuilds"] += 1
+        return self._dates
+
+    def all_desc(self) -> list[str]:
+        """Every part2 date, newest first (shared per version; don't mutate)."""
+        self._current()
+        return self._desc
+
+    def latest(self) -> Optional[str]:
+        dates = self._current()
+        return dates[-1] if dates else None
+
+    def contains(self, date: str) -> bool:
+        dates = self._current()
+        i = bisect_left(dates, date)
+        return i < len(dates) and dates[i] == date
+
+    def last_n(self, n: int) -> list[str]:
+        """The last *n* dates, newest first."""
+        dates = self._current()
+        return dates[-n:][::-1] if n > 0 else []
+
+    def ending_at(self, date: str, n: int) -> list[str]:
+        """Up to *n* dates <= *date*, newest first."""
+        dates = self._current()
+        hi = bisect_right(dates, date)
+        return dates[max(0, hi - n):hi][::-1] if n > 0 else []
+
+    def prev(self, date: str) -> Optional[str]:
+        """Latest date strictly before *date*."""
+        dates = self._current()
+        i = bisect_left(dates, date)
+        return dates[i - 1] if i > 0 else None
+
+    def next(self, date: str) -> Optional[str]:
+        """Earliest date strictly after *date*."""
+        dates = self._current()
+        i = bisect_right(dates, date)
+        return dates[i] if i < len(dates) else None
+
+    def snapshot(self) -> dict:
+        dates = self._dates
+        return {
+            "count": len(dates),
+            "latest": dates[-1] if dates else None,
+            **self.stats,
+        }
+
+
+_date_index = _DateIndex()
+
+
+def _get_last_n_part2_dates(n: int = 3) -> list[str]:
+    """Return the last *n* distinct dates that have part2_rank data, newest first."""
+    return _date_index.last_n(n)
 
 
 def _compute_3day_status(ticker: str, dates: list[str], ticker_dates_map: dict) -> str:
@@ -321,36 +1637,73 @@ def _compute_3day_status(ticker: str, dates: list[str], ticker_dates_map: dict)
     return "\U0001f195"  # new
 
 
-def _build_ticker_dates_map(conn, dates: list[str]) -> dict:
-    """Build {ticker: set(dates)} for the given dates where part2_rank IS NOT NULL."""
-    if not dates:
+def _fetch_rank_context(conn, tickers: list[str], dates: list[str]) -> dict:
+    """Batch-load rank context for *tickers* across *dates* in one query.
+
+    Returns {ticker: {date: {date, part2_rank, composite_rank, adj_score, price}}}
+    — the in-memory input for status, rank history and rank-change tags.
+    """
+    if not tickers or not dates:
         return {}
-    placeholders = ",".join("?" for _ in dates)
+    date_ph = ",".join("?" for _ in dates)
+    ticker_ph = ",".join("?" for _ in tickers)
     cur = conn.execute(
-        f"SELECT ticker, date FROM ntm_screening "
-        f"WHERE part2_rank IS NOT NULL AND date IN ({placeholders})",
-        dates,
+        f"SELECT ticker, date, part2_rank, composite_rank, adj_score, price "
+        f"FROM ntm_screening "
+        f"WHERE date IN ({date_ph}) AND ticker IN ({ticker_ph})",
+        list(dates) + list(tickers),
     )
-    result: dict[str, set] = {}
+    result: dict[str, dict] = {}
     for r in cur.fetchall():
-        result.setdefault(r["ticker"], set()).add(r["date"])
+        result.setdefault(r["ticker"], {})[r["date"]] = {
+            "date": r["date"],
+            "part2_rank": r["part2_rank"],
+            "composite_rank": r["composite_rank"],
+            "adj_score": r["adj_score"],
+            "price": r["price"],
+        }
     return result
 
 
-def _build_rank_history(ticker: str, dates: list[str], conn, status_3d: str = "") -> str:
+def _ticker_dates_from_context(context: dict) -> dict:
+    """Derive {ticker: set(dates)} (part2_rank IS NOT NULL) from a rank context."""
+    return {
+        ticker: {d for d, r in by_date.items() if r["part2_rank"] is not None}
+        for ticker, by_date in context.items()
+    }
+
+
+def _top30_context(conn, date: str, ctx: Optional[dict], tickers: Optional[list[str]] = None) -> dict:
+    """Per-date context shared by the screening and stats builders.
+
+    {last3, rank_ctx, td_map} for the date's Top-30 tickers; computed once
+    and memoized in *ctx* when a caller builds several sections for a date.
+    """
+    if ctx is not None and "rank_ctx" in ctx:
+        return ctx
+    if tickers is None:
+        cur = conn.execute(
+            "SELECT ticker FROM ntm_screening WHERE date = ? AND part2_rank IS NOT NULL",
+            (date,),
+        )
+        tickers = [r["ticker"] for r in cur.fetchall()]
+    last3 = _get_last_n_part2_dates(3)
+    rank_ctx = _fetch_rank_context(conn, tickers, last3)
+    result = {"last3": last3, "rank_ctx": rank_ctx, "td_map": _ticker_dates_from_context(rank_ctx)}
+    if ctx is not None:
+        ctx.update(result)
+    return result
+
+
+def _build_rank_history(dates: list[str], data_by_date: dict, status_3d: str = "") -> str:
     """Return e.g. '3→4→1' for last 3 dates (oldest→newest).
-    Aligns with status marker: 🆕→'-→-→r0', ⏳→'-→r1→r0', ✅→full history."""
+    Aligns with status marker: 🆕→'-→-→r0', ⏳→'-→r1→r0', ✅→full history.
+    data_by_date: {date: row} for one ticker, as built by _fetch_rank_context."""
     if not dates:
         return ""
     # dates are newest-first; reverse to oldest-first for display
     ordered = list(reversed(dates))
-    placeholders = ",".join("?" for _ in ordered)
-    cur = conn.execute(
-        f"SELECT date, composite_rank FROM ntm_screening "
-        f"WHERE ticker = ? AND date IN ({placeholders})",
-        [ticker] + ordered,
-    )
-    rank_by_date = {r["date"]: r["composite_rank"] for r in cur.fetchall()}
+    rank_by_date = {d: r["composite_rank"] for d, r in data_by_date.items()}
 
     if status_3d == "\U0001f195":  # 🆕
         r0 = rank_by_date.get(ordered[-1]) if ordered else None
@@ -368,9 +1721,10 @@ def _build_rank_history(ticker: str, dates: list[str], conn, status_3d: str = ""
         return "\u2192".join(parts)
 
 
-def _compute_rank_change_tags(ticker: str, dates: list[str], conn) -> str:
+def _compute_rank_change_tags(dates: list[str], data_by_date: dict) -> str:
     """Compute rank change tags based on price and adj_score σ thresholds.
-    Returns tag string like '📈가격↑' or '📉가격↓ ⚠️전망↓'."""
+    Returns tag string like '📈가격↑' or '📉가격↓ ⚠️전망↓'.
+    data_by_date: {date: row} for one ticker, as built by _fetch_rank_context."""
     PRICE_STD = 2.83  # daily stock return σ %
     SCORE_STD = 1.48  # adj_score daily change σ
     RANK_THRESHOLD = 3
@@ -380,13 +1734,6 @@ def _compute_rank_change_tags(ticker: str, dates: list[str], conn) -> str:
 
     # dates are newest-first
     ordered = list(reversed(dates))  # oldest-first
-    placeholders = ",".join("?" for _ in ordered)
-    cur = conn.execute(
-        f"SELECT date, composite_rank, adj_score, price FROM ntm_screening "
-        f"WHERE ticker = ? AND date IN ({placeholders})",
-        [ticker] + ordered,
-    )
-    data_by_date = {r["date"]: dict(r) for r in cur.fetchall()}
 
     t0_date = ordered[-1]
     t0 = data_by_date.get(t0_date)
@@ -430,174 +1777,467 @@ def _compute_rank_change_tags(ticker: str, dates: list[str], conn) -> str:
     return " ".join(tag_parts)
 
 
-def _compute_risk_flags(row: dict) -> list[dict]:
-    """Compute risk flags for a screening row."""
-    flags = []
-    rev_up = row.get("rev_up30") or 0
-    rev_down = row.get("rev_down30") or 0
-    total_rev = rev_up + rev_down
-    if total_rev > 0 and rev_down / total_rev > 0.3:
-        flags.append({
-            "type": "revenue_downgrade",
-            "label": "하향",
-            "detail": f"하향 {rev_down}/{total_rev} ({rev_down/total_rev*100:.0f}%)",
-        })
-    num_analysts = row.get("num_analysts") or 0
-    if num_analysts < 3:
-        flags.append({
-            "type": "low_coverage",
-            "label": "저커버리지",
-            "detail": f"애널리스트 {num_analysts}명",
-        })
-    # fwd_pe > 100 check (use computed fwd_pe)
-    ntm_current = row.get("ntm_current") or 0
-    price = row.get("price") or 0
-    if ntm_current > 0:
-        fwd_pe = price / ntm_current
-        if fwd_pe > 100:
-            flags.append({
-                "type": "high_pe",
-                "label": "고평가",
-                "detail": f"Fwd P/E {fwd_pe:.1f}x",
-            })
-    return flags
+# ---------------------------------------------------------------------------
+# Rolling order statistics (HY 10y median, VIX 1y percentile)
+# ---------------------------------------------------------------------------
+
+
+class _SortedWindow:
+    """Fixed-size sliding window kept in sorted order.
+
+    push() is a bisect insert plus (once full) a bisect remove of the oldest
+    value, so each new observation costs O(log w) search + one memmove
+    instead of re-sorting the window.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._fifo: deque = deque()
+        self._sorted: list[float] = []
+
+    @classmethod
+    def from_values(cls, values: list[float], size: int) -> "_SortedWindow":
+        win = cls(size)
+        for v in values[-size:]:
+            win.push(v)
+        return win
+
+    def __len__(self) -> int:
+        return len(self._fifo)
+
+    def push(self, x: float):
+        self._fifo.append(x)
+        insort(self._sorted, x)
+        if len(self._fifo) > self.size:
+            old = self._fifo.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+
+    def median(self) -> float:
+        # Same operand order as pandas roll_median_c
+        s, n = self._sorted, len(self._sorted)
+        mid = n // 2
+        return s[mid] if n % 2 else (s[mid] + s[mid - 1]) / 2
+
+    def pct_rank(self, x: float) -> float:
+        """pandas rolling rank(method="average", pct=True) of *x* in the window."""
+        s, n = self._sorted, len(self._sorted)
+        rank = bisect_right(s, x)          # max rank of x
+        rank_min = bisect_left(s, x) + 1   # min rank of x
+        # Same expression as pandas roll_rank so results are bit-identical
+        avg = ((rank * (rank + 1) / 2) - ((rank_min - 1) * rank_min / 2)) / (rank - rank_min + 1)
+        return avg / n
+
+
+class _RollingSeries:
+    """Incremental rolling median / percentile state for one series.
+
+    Mirrors pandas ``rolling(window, min_periods)`` applied to the rows
+    passed to update(), but keeps its window between calls: when the new
+    rows extend what was already consumed, only the new observations are
+    pushed. Anything else (first call, revised value, gap) rebuilds.
+    Medians are recorded per position; a position whose window would reach
+    before the current frame start is recomputed from the frame directly.
+    Rows before the frame start are dropped once they outnumber the window,
+    so the history holds at most about window + frame rows.
+    """
+
+    def __init__(self, window: int, min_periods: int):
+        self.window = window
+        self.min_periods = min_periods
+        self._lock = threading.Lock()
+        self.stats = {"pushes": 0, "rebuilds": 0}
+        self._reset()
+
+    def _reset(self):
+        self._win = _SortedWindow(self.window)
+        self._dates: list[str] = []
+        self._values: list[float] = []
+        self._medians: list[float] = []
+        self._offset = 0  # index in _values of the current frame's first row
+        self._dropped = 0  # rows trimmed off the front since the last rebuild
+
+    def _push(self, date: str, value: float):
+        self._win.push(value)
+        self._dates.append(date)
+        self._values.append(value)
+        self._medians.append(self._win.median() if len(self._win) >= self.min_periods else math.nan)
+        self.stats["pushes"] += 1
+
+    def _resume_index(self, observations: list[tuple[str, float]]) -> Optional[int]:
+        """Index of the first unconsumed observation, or None if state can't be reused."""
+        if not self._dates or not observations:
+            return None
+        offset = bisect_left(self._dates, observations[0][0])
+        if offset >= len(self._dates) or self._dates[offset] != observations[0][0]:
+            return None
+        k = len(self._dates) - offset  # rows of the frame already consumed
+        if k > len(observations) or observations[k - 1] != (self._dates[-1], self._values[-1]):
+            return None
+        self._offset = offset
+        return k
+
+    def update(self, observations: list[tuple[str, float]]) -> list[float]:
+        """Sync with *observations* (oldest first) and return their values."""
+        with self._lock:
+            k = self._resume_index(observations)
+            if k is None:
+                self._reset()
+                self.stats["rebuilds"] += 1
+                k = 0
+            for date, value in observations[k:]:
+                self._push(date, value)
+            if self._offset > self.window:
+                self._trim()
+            return self._values[self._offset:]
+
+    def _trim(self):
+        # Caller holds self._lock. Rows before the frame are never read again
+        # (clipped positions recompute from the frame), so drop them.
+        n = self._offset
+        del self._dates[:n], self._values[:n], self._medians[:n]
+        self._offset = 0
+        self._dropped += n
+
+    def _clipped(self, j: int) -> bool:
+        # True if position j's window reaches before the current frame start
+        return self._offset + self._dropped > 0 and j - self.window + 1 < self._offset
+
+    def median_at(self, i: int) -> float:
+        """Rolling median at frame position *i* (NaN below min_periods)."""
+        with self._lock:
+            j = self._offset + i
+            if not self._clipped(j):
+                return self._medians[j]
+            vals = self._values[self._offset:j + 1]
+        if len(vals) < self.min_periods:
+            return math.nan
+        return _SortedWindow.from_values(vals, self.window).median()
+
+    def pct_rank_last(self) -> float:
+        """Rolling percentile rank (0~1) of the newest value (NaN below min_periods)."""
+        with self._lock:
+            j = len(self._values) - 1
+            if self._clipped(j):
+                win = _SortedWindow.from_values(self._values[self._offset:], self.window)
+            else:
+                win = self._win
+            if len(win) < self.min_periods:
+                return math.nan
+            return win.pct_rank(self._values[j])
+
+
+_hy_rolling = _RollingSeries(2520, 1260)   # 10-year median, min 5 years
+_vix_rolling = _RollingSeries(252, 126)    # 1-year percentile, min 6 months
 
 
 # ---------------------------------------------------------------------------
 # Market data fetching (ported from daily_runner.py)
 # ---------------------------------------------------------------------------
 
+# Network fetches run here so one slow source never serializes the others.
+# Sized for two rounds in flight (a timed-out round keeps its threads busy).
+_market_fetch_executor = ThreadPoolExecutor(max_workers=MARKET_FETCH_WORKERS, thread_name_prefix="market-fetch")
 
-def _fetch_hy_quadrant() -> Optional[dict]:
-    """HY Spread Verdad 4-quadrant + thaw signals (FRED BAMLH0A0HYM2).
 
-    Ported from daily_runner.py fetch_hy_quadrant().
-    Level: HY vs 10-year rolling median (wide/narrow)
-    Direction: current vs 63 biz days (3 months) ago (rising/falling)
-    Q1 recovery(wide+falling), Q2 growth(narrow+falling),
-    Q3 overheating(narrow+rising), Q4 recession(wide+rising)
+class _SeriesStore:
+    """Local FRED observations (series_id, date, value) in a side SQLite file.
+
+    Each refresh only asks FRED for the last FRED_OVERLAP_DAYS before the
+    newest stored observation onward (re-fetched and upserted in case they
+    were revised), so the 10-year HY history is downloaded once rather than
+    on every refresh.
     """
-    import pandas as pd
-    import numpy as np
 
-    for attempt in range(3):
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"syncs": 0, "sync_failures": 0, "rows_written": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fred_series ("
+                "series_id TEXT NOT NULL, date TEXT NOT NULL, value REAL NOT NULL, "
+                "PRIMARY KEY (series_id, date))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS index_bars ("
+                "symbol TEXT NOT NULL, date TEXT NOT NULL, close REAL NOT NULL, "
+                "PRIMARY KEY (symbol, date))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def last_date(self, series_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT MAX(date) FROM fred_series WHERE series_id = ?", (series_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, series_id: str, observations: list[tuple[str, float]]) -> int:
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO fred_series (series_id, date, value) VALUES (?, ?, ?)",
+                [(series_id, d, v) for d, v in observations],
+            )
+            conn.commit()
+            self.stats["rows_written"] += len(observations)
+        return len(observations)
+
+    def last_bar_dates(self, symbols: list[str]) -> dict[str, str]:
+        """{symbol: newest cached bar date} for symbols that have any bars."""
+        ph = ",".join("?" for _ in symbols)
+        with self._lock:
+            cur = self._connection().execute(
+                f"SELECT symbol, MAX(date) FROM index_bars WHERE symbol IN ({ph}) GROUP BY symbol",
+                symbols,
+            )
+            return dict(cur.fetchall())
+
+    def upsert_bars(self, bars: dict[str, list[tuple[str, float]]]) -> int:
+        rows = [(sym, d, c) for sym, series in bars.items() for d, c in series]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO index_bars (symbol, date, close) VALUES (?, ?, ?)", rows
+            )
+            conn.commit()
+            self.stats["rows_written"] += len(rows)
+        return len(rows)
+
+    def load_last_bars(self, symbol: str, n: int) -> list[tuple[str, float]]:
+        """Newest *n* cached bars for *symbol*, oldest first."""
+        with self._lock:
+            cur = self._connection().execute(
+                "SELECT date, close FROM index_bars WHERE symbol = ? ORDER BY date DESC LIMIT ?",
+                (symbol, n),
+            )
+            return list(reversed(cur.fetchall()))
+
+    def record_sync(self, ok: bool):
+        with self._lock:
+            self.stats["syncs" if ok else "sync_failures"] += 1
+
+    def load(self, series_id: str, start_date: str) -> list[tuple[str, float]]:
+        """All stored observations on/after *start_date*, oldest first."""
+        with self._lock:
+            cur = self._connection().execute(
+                "SELECT date, value FROM fred_series "
+                "WHERE series_id = ? AND date >= ? ORDER BY date",
+                (series_id, start_date),
+            )
+            return [(r[0], r[1]) for r in cur.fetchall()]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            if self._conn is None and not os.path.exists(self.path):
+                # Reporting must not create the store file
+                return {"path": self.path, "series": {}, **self.stats}
+            conn = self._connection()
+            counts = dict(conn.execute(
+                "SELECT series_id, COUNT(*) FROM fred_series GROUP BY series_id"
+            ).fetchall())
+            counts.update(conn.execute(
+                "SELECT symbol, COUNT(*) FROM index_bars GROUP BY symbol"
+            ).fetchall())
+            return {"path": self.path, "series": counts, **self.stats}
+
+
+_series_store = _SeriesStore(MARKET_STORE_PATH)
+
+
+def _parse_fred_csv(csv_data: str, start_date: str, end_date: str) -> list[tuple[str, float]]:
+    """Parse fredgraph.csv text -> [(date, value)], skipping missing ('.'/blank) values."""
+    observations = []
+    reader = csv.reader(io.StringIO(csv_data))
+    next(reader, None)  # header: observation_date,<SERIES_ID>
+    for row in reader:
+        if len(row) < 2:
+            continue
+        date, raw = row[0].strip(), row[1].strip()
+        if not (start_date <= date <= end_date):
+            continue
         try:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=365 * 11)).strftime("%Y-%m-%d")
-            url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id=BAMLH0A0HYM2&cosd={start_date}&coed={end_date}"
+            value = float(raw)
+        except ValueError:
+            continue
+        if value != value:  # NaN
+            continue
+        observations.append((date, value))
+    return observations
+
+
+def _fetch_fred_observations(series_id: str, start_date: str, end_date: str) -> list[tuple[str, float]]:
+    """Download [start_date, end_date] of a FRED series (or read the fixture file)."""
+    with _upstream_fetch("fred", series_id):
+        if FRED_FIXTURE_DIR:
+            with open(os.path.join(FRED_FIXTURE_DIR, f"{series_id}.csv"), "r", encoding="utf-8") as f:
+                csv_data = f.read()
+        else:
+            url = (
+                f"https://fred.stlouisfed.org/graph/fredgraph.csv"
+                f"?id={series_id}&cosd={start_date}&coed={end_date}"
+            )
             req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
             with urllib.request.urlopen(req, timeout=15) as response:
                 csv_data = response.read().decode("utf-8")
+    return _parse_fred_csv(csv_data, start_date, end_date)
 
-            df = pd.read_csv(io.StringIO(csv_data), parse_dates=["observation_date"])
-            df.columns = ["date", "hy_spread"]
-            df = df.dropna(subset=["hy_spread"])
-            df["hy_spread"] = pd.to_numeric(df["hy_spread"], errors="coerce")
-            df = df.dropna().set_index("date").sort_index()
 
-            if len(df) < 1260:
-                return None
+def _sync_fred_series(series_id: str, lookback_days: int) -> list[tuple[str, float]]:
+    """Upsert new and recently revised FRED observations into the local
+    store, then return the last *lookback_days* of data from it (oldest first).
 
-            # 10-year rolling median (min 5 years)
-            df["median_10y"] = df["hy_spread"].rolling(2520, min_periods=1260).median()
+    With local history present a failed download falls back to stored data
+    immediately; on a cold store it retries like the original fetchers.
+    """
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    last = _series_store.last_date(series_id)
+    fetch_from = start_date
+    if last:
+        overlap = (datetime.strptime(last, "%Y-%m-%d") - timedelta(days=FRED_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+        fetch_from = max(overlap, start_date)
 
-            hy_spread = float(df["hy_spread"].iloc[-1])
-            hy_prev = float(df["hy_spread"].iloc[-2])
-            median_10y = float(df["median_10y"].iloc[-1])
+    for attempt in range(3):
+        try:
+            observations = _fetch_fred_observations(series_id, fetch_from, end_date)
+            _series_store.upsert(series_id, observations)
+            _series_store.record_sync(ok=True)
+            break
+        except Exception:
+            _series_store.record_sync(ok=False)
+            if last is None and attempt < 2:
+                time.sleep(5)
+            else:
+                break
 
-            if pd.isna(median_10y):
-                return None
+    return _series_store.load(series_id, start_date)
 
-            # 3 months (63 biz days) ago
-            hy_3m_ago = float(df["hy_spread"].iloc[-63]) if len(df) >= 63 else float(df["hy_spread"].iloc[0])
-
-            # Quadrant determination
-            is_wide = hy_spread >= median_10y
-            is_rising = hy_spread >= hy_3m_ago
-
-            if is_wide and not is_rising:
-                quadrant, label, icon = "Q1", "봄(회복국면)", "spring"
-            elif not is_wide and not is_rising:
-                quadrant, label, icon = "Q2", "여름(성장국면)", "summer"
-            elif not is_wide and is_rising:
-                quadrant, label, icon = "Q3", "가을(과열국면)", "autumn"
-            else:  # wide and rising
-                quadrant, label, icon = "Q4", "겨울(침체국면)", "winter"
-
-            # Thaw signals
-            signals = []
-            daily_change_bp = (hy_spread - hy_prev) * 100
-
-            # 1) HY 4~5% with -20bp sharp contraction
-            if 4 <= hy_spread <= 5 and daily_change_bp <= -20:
-                signals.append(f"HY {hy_spread:.2f}%, 전일 대비 {daily_change_bp:+.0f}bp 급락 — 반등 매수 기회에요!")
-
-            # 2) Crossing below 5%
-            if hy_prev >= 5 and hy_spread < 5:
-                signals.append(f"HY {hy_spread:.2f}%로 5% 밑으로 내려왔어요 — 적극 매수 구간이에요!")
-
-            # 3) 60-day peak -300bp or more decline
-            peak_60d = float(df["hy_spread"].rolling(60).max().iloc[-1])
-            from_peak_bp = (hy_spread - peak_60d) * 100
-            if from_peak_bp <= -300:
-                signals.append(f"60일 고점 대비 {from_peak_bp:.0f}bp 하락 — 바닥 신호, 적극 매수하세요!")
-
-            # 4) Q4->Q1 transition
-            prev_wide = hy_prev >= median_10y
-            hy_3m_ago_prev = float(df["hy_spread"].iloc[-64]) if len(df) >= 64 else float(df["hy_spread"].iloc[0])
-            prev_rising = hy_prev >= hy_3m_ago_prev
-            prev_was_q4 = prev_wide and prev_rising
-            now_is_q1 = is_wide and not is_rising
-            if prev_was_q4 and now_is_q1:
-                signals.append("겨울 -> 봄 전환 — 가장 좋은 매수 타이밍이에요!")
-
-            # Days in current quadrant (up to 252 biz days)
-            df["hy_3m"] = df["hy_spread"].shift(63)
-            valid_mask = df["median_10y"].notna() & df["hy_3m"].notna()
-            df.loc[valid_mask, "q"] = np.where(
-                df.loc[valid_mask, "hy_spread"] >= df.loc[valid_mask, "median_10y"],
-                np.where(df.loc[valid_mask, "hy_spread"] >= df.loc[valid_mask, "hy_3m"], "Q4", "Q1"),
-                np.where(df.loc[valid_mask, "hy_spread"] >= df.loc[valid_mask, "hy_3m"], "Q3", "Q2"),
-            )
-            q_days = 1
-            for i in range(len(df) - 2, max(len(df) - 253, 0) - 1, -1):
-                if i >= 0 and df["q"].iloc[i] == quadrant:
-                    q_days += 1
-                else:
-                    break
 
-            # HY standalone action (fallback; final decision in concordance)
-            if quadrant == "Q1":
-                action = "적극 매수하세요."
-            elif quadrant == "Q2":
-                action = "평소대로 투자하세요."
-            elif quadrant == "Q3":
-                action = "신규 매수 시 신중하세요."
-            else:  # Q4
-                action = "신규 매수를 멈추고 관망하세요."
+def _fetch_hy_quadrant() -> Optional[dict]:
+    """HY Spread Verdad 4-quadrant + thaw signals (FRED BAMLH0A0HYM2).
 
-            # Direction for concordance
-            direction = "warn" if quadrant in ("Q3", "Q4") else "stable"
+    Ported from daily_runner.py fetch_hy_quadrant().
+    Level: HY vs 10-year rolling median (wide/narrow)
+    Direction: current vs 63 biz days (3 months) ago (rising/falling)
+    Q1 recovery(wide+falling), Q2 growth(narrow+falling),
+    Q3 overheating(narrow+rising), Q4 recession(wide+rising)
+    Observations are read from the local series store (_sync_fred_series);
+    the rolling median is maintained incrementally by _hy_rolling.
+    """
+    try:
+        observations = _sync_fred_series("BAMLH0A0HYM2", 365 * 11)
+        values = _hy_rolling.update(observations)
+        n = len(values)
+
+        if n < 1260:
+            return None
+
+        # 10-year rolling median (min 5 years)
+        hy_spread = values[-1]
+        hy_prev = values[-2]
+        median_10y = _hy_rolling.median_at(n - 1)
+
+        if math.isnan(median_10y):
+            return None
+
+        # 3 months (63 biz days) ago
+        hy_3m_ago = values[-63] if n >= 63 else values[0]
+
+        # Quadrant determination
+        is_wide = hy_spread >= median_10y
+        is_rising = hy_spread >= hy_3m_ago
+
+        if is_wide and not is_rising:
+            quadrant, label, icon = "Q1", "봄(회복국면)", "spring"
+        elif not is_wide and not is_rising:
+            quadrant, label, icon = "Q2", "여름(성장국면)", "summer"
+        elif not is_wide and is_rising:
+            quadrant, label, icon = "Q3", "가을(과열국면)", "autumn"
+        else:  # wide and rising
+            quadrant, label, icon = "Q4", "겨울(침체국면)", "winter"
+
+        # Thaw signals
+        signals = []
+        daily_change_bp = (hy_spread - hy_prev) * 100
+
+        # 1) HY 4~5% with -20bp sharp contraction
+        if 4 <= hy_spread <= 5 and daily_change_bp <= -20:
+            signals.append(f"HY {hy_spread:.2f}%, 전일 대비 {daily_change_bp:+.0f}bp 급락 — 반등 매수 기회에요!")
+
+        # 2) Crossing below 5%
+        if hy_prev >= 5 and hy_spread < 5:
+            signals.append(f"HY {hy_spread:.2f}%로 5% 밑으로 내려왔어요 — 적극 매수 구간이에요!")
+
+        # 3) 60-day peak -300bp or more decline
+        peak_60d = max(values[-60:])
+        from_peak_bp = (hy_spread - peak_60d) * 100
+        if from_peak_bp <= -300:
+            signals.append(f"60일 고점 대비 {from_peak_bp:.0f}bp 하락 — 바닥 신호, 적극 매수하세요!")
+
+        # 4) Q4->Q1 transition
+        prev_wide = hy_prev >= median_10y
+        hy_3m_ago_prev = values[-64] if n >= 64 else values[0]
+        prev_rising = hy_prev >= hy_3m_ago_prev
+        prev_was_q4 = prev_wide and prev_rising
+        now_is_q1 = is_wide and not is_rising
+        if prev_was_q4 and now_is_q1:
+            signals.append("겨울 -> 봄 전환 — 가장 좋은 매수 타이밍이에요!")
+
+        # Days in current quadrant (up to 252 biz days)
+        def quadrant_at(i: int) -> Optional[str]:
+            med = _hy_rolling.median_at(i)
+            if i < 63 or math.isnan(med):
+                return None
+            rising = values[i] >= values[i - 63]
+            if values[i] >= med:
+                return "Q4" if rising else "Q1"
+            return "Q3" if rising else "Q2"
+
+        q_days = 1
+        for i in range(n - 2, max(n - 253, 0) - 1, -1):
+            if quadrant_at(i) == quadrant:
+                q_days += 1
+            else:
+                break
+
+        # HY standalone action (fallback; final decision in concordance)
+        if quadrant == "Q1":
+            action = "적극 매수하세요."
+        elif quadrant == "Q2":
+            action = "평소대로 투자하세요."
+        elif quadrant == "Q3":
+            action = "신규 매수 시 신중하세요."
+        else:  # Q4
+            action = "신규 매수를 멈추고 관망하세요."
 
-            return {
-                "hy_spread": round(hy_spread, 2),
-                "median_10y": round(median_10y, 2),
-                "hy_3m_ago": round(hy_3m_ago, 2),
-                "hy_prev": round(hy_prev, 2),
-                "quadrant": quadrant,
-                "quadrant_label": label,
-                "season_icon": icon,
-                "signals": signals,
-                "q_days": q_days,
-                "action": action,
-                "direction": direction,
-            }
+        # Direction for concordance
+        direction = "warn" if quadrant in ("Q3", "Q4") else "stable"
 
-        except Exception:
-            if attempt < 2:
-                time.sleep(5)
-            else:
-                return None
+        return {
+            "hy_spread": round(hy_spread, 2),
+            "median_10y": round(median_10y, 2),
+            "hy_3m_ago": round(hy_3m_ago, 2),
+            "hy_prev": round(hy_prev, 2),
+            "quadrant": quadrant,
+            "quadrant_label": label,
+            "season_icon": icon,
+            "signals": signals,
+            "q_days": q_days,
+            "action": action,
+            "direction": direction,
+        }
+
+    except Exception:
+        return None
 
 
 def _fetch_vix_data() -> Optional[dict]:
@@ -607,127 +2247,175 @@ def _fetch_vix_data() -> Optional[dict]:
     252-day (1-year) percentile-based regime determination.
     <10th: complacency | 10~67th: normal | 67~80th: elevated |
     80~90th: high | 90th+: crisis
+    Observations are read from the local series store (_sync_fred_series);
+    the rolling percentile is maintained incrementally by _vix_rolling.
     """
-    import pandas as pd
+    try:
+        observations = _sync_fred_series("VIXCLS", 400)
+        values = _vix_rolling.update(observations)
+        n = len(values)
+
+        if n < 20:
+            return None
+
+        vix_current = values[-1]
+        vix_5d_ago = values[-5] if n >= 5 else values[0]
+        vix_slope = vix_current - vix_5d_ago
+        # Exact mean; can differ from pandas rolling(20).mean() only at
+        # half-cent ties once rounded (see bench_rolling.py)
+        vix_ma_20 = math.fsum(values[-20:]) / 20
+
+        # 252-day (1-year) percentile (min 126 days)
+        vix_pct = _vix_rolling.pct_rank_last() * 100
+
+        # Slope direction (+/- 0.5 threshold)
+        if vix_slope > 0.5:
+            slope_dir = "rising"
+        elif vix_slope < -0.5:
+            slope_dir = "falling"
+        else:
+            slope_dir = "flat"
 
-    for attempt in range(3):
-        try:
-            end_date = datetime.now().strftime("%Y-%m-%d")
-            start_date = (datetime.now() - timedelta(days=400)).strftime("%Y-%m-%d")
-            url = (
-                f"https://fred.stlouisfed.org/graph/fredgraph.csv"
-                f"?id=VIXCLS&cosd={start_date}&coed={end_date}"
-            )
-            req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-            with urllib.request.urlopen(req, timeout=15) as response:
-                csv_data = response.read().decode("utf-8")
+        # Percentile-based regime + cash adjustment
+        if vix_pct >= 90:
+            if slope_dir in ("rising", "flat"):
+                regime, label, icon = "crisis", "위기", "crisis"
+                cash_adj = 15
+            else:
+                regime, label, icon = "crisis_relief", "공포완화", "crisis_relief"
+                cash_adj = -10
+        elif vix_pct >= 80:
+            if slope_dir == "rising":
+                regime, label, icon = "high", "상승경보", "high"
+                cash_adj = 10
+            else:
+                regime, label, icon = "high_stable", "높지만안정", "high_stable"
+                cash_adj = 0
+        elif vix_pct >= 67:
+            if slope_dir == "rising":
+                regime, label, icon = "elevated", "경계", "elevated"
+                cash_adj = 5
+            elif slope_dir == "falling":
+                regime, label, icon = "stabilizing", "안정화", "stabilizing"
+                cash_adj = -5
+            else:
+                regime, label, icon = "elevated_flat", "보통", "elevated_flat"
+                cash_adj = 0
+        elif vix_pct < 10:
+            regime, label, icon = "complacency", "안일", "complacency"
+            cash_adj = 5
+        else:
+            regime, label, icon = "normal", "안정", "normal"
+            cash_adj = 0
 
-            df = pd.read_csv(io.StringIO(csv_data), parse_dates=["observation_date"])
-            df.columns = ["date", "vix"]
-            df["vix"] = pd.to_numeric(df["vix"], errors="coerce")
-            df = df.dropna().set_index("date").sort_index()
+        # Direction for concordance
+        direction = "warn" if regime in ("crisis", "crisis_relief", "high", "elevated", "complacency") else "stable"
 
-            if len(df) < 20:
-                return None
+        return {
+            "vix_current": round(vix_current, 2),
+            "vix_5d_ago": round(vix_5d_ago, 2),
+            "vix_slope": round(vix_slope, 2),
+            "vix_slope_dir": slope_dir,
+            "vix_ma_20": round(vix_ma_20, 2),
+            "vix_percentile": round(vix_pct, 1),
+            "regime": regime,
+            "regime_label": label,
+            "regime_icon": icon,
+            "cash_adjustment": cash_adj,
+            "direction": direction,
+        }
 
-            vix_current = float(df["vix"].iloc[-1])
-            vix_5d_ago = float(df["vix"].iloc[-5]) if len(df) >= 5 else float(df["vix"].iloc[0])
-            vix_slope = vix_current - vix_5d_ago
-            vix_ma_20 = float(df["vix"].rolling(20).mean().iloc[-1])
+    except Exception:
+        return None
 
-            # 252-day (1-year) percentile (min 126 days)
-            vix_pct = float(df["vix"].rolling(252, min_periods=126).rank(pct=True).iloc[-1] * 100)
 
-            # Slope direction (+/- 0.5 threshold)
-            if vix_slope > 0.5:
-                slope_dir = "rising"
-            elif vix_slope < -0.5:
-                slope_dir = "falling"
-            else:
-                slope_dir = "flat"
+def _yf_download_bars(symbols: list[str], start: Optional[str]) -> dict[str, list[tuple[str, float]]]:
+    """Daily closes for all *symbols* in one yfinance download.
 
-            # Percentile-based regime + cash adjustment
-            if vix_pct >= 90:
-                if slope_dir in ("rising", "flat"):
-                    regime, label, icon = "crisis", "위기", "crisis"
-                    cash_adj = 15
-                else:
-                    regime, label, icon = "crisis_relief", "공포완화", "crisis_relief"
-                    cash_adj = -10
-            elif vix_pct >= 80:
-                if slope_dir == "rising":
-                    regime, label, icon = "high", "상승경보", "high"
-                    cash_adj = 10
-                else:
-                    regime, label, icon = "high_stable", "높지만안정", "high_stable"
-                    cash_adj = 0
-            elif vix_pct >= 67:
-                if slope_dir == "rising":
-                    regime, label, icon = "elevated", "경계", "elevated"
-                    cash_adj = 5
-                elif slope_dir == "falling":
-                    regime, label, icon = "stabilizing", "안정화", "stabilizing"
-                    cash_adj = -5
-                else:
-                    regime, label, icon = "elevated_flat", "보통", "elevated_flat"
-                    cash_adj = 0
-            elif vix_pct < 10:
-                regime, label, icon = "complacency", "안일", "complacency"
-                cash_adj = 5
-            else:
-                regime, label, icon = "normal", "안정", "normal"
-                cash_adj = 0
+    start=None fetches the last 5 days (cold cache); otherwise bars from
+    *start* (inclusive) so the newest cached bar is refreshed too.
+    """
+    if yf is None:
+        return {}
+    kwargs = {"start": start} if start else {"period": "5d"}
+    with _upstream_fetch("yfinance", "indices") as labels:
+        df = yf.download(
+            symbols, interval="1d", group_by="ticker", auto_adjust=True,
+            progress=False, threads=False, timeout=15, **kwargs,
+        )
+    if df is None or df.empty:
+        # yfinance logs download errors and returns an empty frame instead of raising
+        _metrics.inc("eps_upstream_fetch_failures_total", labels)
+        return {}
+    bars = {}
+    for symbol in symbols:
+        try:
+            closes = df[symbol]["Close"] if df.columns.nlevels > 1 else df["Close"]
+        except KeyError:
+            continue
+        bars[symbol] = [(idx.strftime("%Y-%m-%d"), float(v)) for idx, v in closes.dropna().items()]
+    return bars
 
-            # Direction for concordance
-            direction = "warn" if regime in ("crisis", "crisis_relief", "high", "elevated", "complacency") else "stable"
 
-            return {
-                "vix_current": round(vix_current, 2),
-                "vix_5d_ago": round(vix_5d_ago, 2),
-                "vix_slope": round(vix_slope, 2),
-                "vix_slope_dir": slope_dir,
-                "vix_ma_20": round(vix_ma_20, 2),
-                "vix_percentile": round(vix_pct, 1),
-                "regime": regime,
-                "regime_label": label,
-                "regime_icon": icon,
-                "cash_adjustment": cash_adj,
-                "direction": direction,
-            }
+def _fixture_index_bars(symbols: list[str], start: Optional[str]) -> dict[str, list[tuple[str, float]]]:
+    """Read <SYMBOL>.csv (date,close) files from INDEX_FIXTURE_DIR instead of yfinance."""
+    bars = {}
+    for symbol in symbols:
+        path = os.path.join(INDEX_FIXTURE_DIR, f"{symbol}.csv")
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            # Same two-column (date,value) layout as fredgraph.csv
+            observations = _parse_fred_csv(f.read(), start or "", "9999-12-31")
+        bars[symbol] = observations if start else observations[-5:]
+    return bars
 
-        except Exception:
-            if attempt < 2:
-                time.sleep(5)
-            else:
-                return None
+
+# (symbols, start_date or None) -> {symbol: [(date, close), ...]}; swappable for tests
+_index_bar_fetcher: Callable[[list[str], Optional[str]], dict] = (
+    _fixture_index_bars if INDEX_FIXTURE_DIR else _yf_download_bars
+)
 
 
 def _fetch_market_indices() -> list[dict]:
-    """Fetch major US market indices via yfinance.
+    """Fetch major US market indices (MARKET_INDICES).
 
-    Ported from daily_runner.py get_market_context().
+    Ported from daily_runner.py get_market_context(). All symbols are
+    requested in one batched download covering only bars from the oldest
+    "newest cached bar" onward, ignoring symbols more than INDEX_STALE_DAYS
+    behind the rest; closes are read back from the local cache, which also
+    serves as the fallback when the download fails.
     """
-    try:
-        import yfinance as yf
-    except ImportError:
+    symbols = [symbol for symbol, _ in MARKET_INDICES]
+    if not symbols:
         return []
 
+    last = _series_store.last_bar_dates(symbols)
+    start = None
+    if len(last) == len(symbols):
+        newest = datetime.strptime(max(last.values()), "%Y-%m-%d")
+        cutoff = (newest - timedelta(days=INDEX_STALE_DAYS)).strftime("%Y-%m-%d")
+        start = min(d for d in last.values() if d >= cutoff)
+    try:
+        bars = _index_bar_fetcher(symbols, start)
+        _series_store.upsert_bars(bars)
+        _series_store.record_sync(ok=True)
+    except Exception:
+        _series_store.record_sync(ok=False)
+
     indices = []
-    for symbol, name in [("^GSPC", "S&P 500"), ("^IXIC", "NASDAQ"), ("^DJI", "Dow Jones")]:
-        try:
-            hist = yf.Ticker(symbol).history(period="5d")
-            if len(hist) >= 2:
-                close = float(hist["Close"].iloc[-1])
-                prev = float(hist["Close"].iloc[-2])
-                chg = (close / prev - 1) * 100
-                indices.append({
-                    "name": name,
-                    "symbol": symbol,
-                    "close": round(close, 2),
-                    "change_pct": round(chg, 2),
-                })
-        except Exception:
-            continue
+    for symbol, name in MARKET_INDICES:
+        hist = _series_store.load_last_bars(symbol, 2)
+        if len(hist) >= 2:
+            close = hist[-1][1]
+            prev = hist[-2][1]
+            chg = (close / prev - 1) * 100
+            indices.append({
+                "name": name,
+                "symbol": symbol,
+                "close": round(close, 2),
+                "change_pct": round(chg, 2),
+            })
     return indices
 
 
@@ -833,23 +2521,552 @@ def _compute_concordance_and_action(hy: Optional[dict], vix: Optional[dict]) ->
     }
 
 
-def _get_market_live_data() -> dict:
-    """Aggregate live market data: indices + HY + VIX + concordance."""
-    hy = _fetch_hy_quadrant()
-    vix = _fetch_vix_data()
-    indices = _fetch_market_indices()
-    conc = _compute_concordance_and_action(hy, vix)
+def _get_market_live_data() -> dict:
+    """Aggregate live market data: indices + HY + VIX + concordance.
+
+    All sources are fetched concurrently under MARKET_FETCH_BUDGET_SEC; a
+    source that has not finished by then — or that raised or came back
+    empty — is reported in missing_sources and left out (hy/vix None,
+    indices empty) instead of holding up the rest.
+    """
+    tasks = {
+        "hy": _market_fetch_executor.submit(_fetch_hy_quadrant),
+        "vix": _market_fetch_executor.submit(_fetch_vix_data),
+        "indices": _market_fetch_executor.submit(_fetch_market_indices),
+    }
+
+    done, _ = wait(tasks.values(), timeout=MARKET_FETCH_BUDGET_SEC)
+    results = {}
+    missing = []
+    for source, fut in tasks.items():
+        result = fut.result() if fut in done and fut.exception() is None else None
+        results[source] = result or None
+        if not result:
+            missing.append(source)
+
+    hy = results["hy"]
+    vix = results["vix"]
+    indices = results["indices"] or []
+    conc = _compute_concordance_and_action(hy, vix)
+
+    return {
+        "indices": indices,
+        "hy": hy,
+        "vix": vix,
+        "concordance": conc["concordance"],
+        "signal_dots": conc["signal_dots"],
+        "final_action": conc["final_action"],
+        "portfolio_mode": conc["portfolio_mode"],
+        "missing_sources": missing,
+        "cached_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+class _MarketRefresher:
+    """Background stale-while-revalidate holder for the market snapshot.
+
+    A daemon thread calls *fetcher* every *interval* seconds; readers always
+    get the last good snapshot immediately. Only the very first read (before
+    any refresh has completed) blocks on a fetch. A refresh that raises, or
+    returns no HY, VIX or index data at all, keeps the previous snapshot.
+    """
+
+    def __init__(self, fetcher: Callable[[], dict], interval: float):
+        self.fetcher = fetcher
+        self.interval = interval
+        self._snapshot: Optional[dict] = None
+        self._fetched_at = 0.0  # time.monotonic() of the last good refresh
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"refreshes": 0, "failures": 0, "last_error": None, "last_duration_sec": None}
+
+    @staticmethod
+    def _is_good(data: Optional[dict]) -> bool:
+        return bool(data) and bool(data.get("hy") or data.get("vix") or data.get("indices"))
+
+    def refresh(self) -> bool:
+        """Fetch once and swap in the result if it is usable. Returns success."""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        # Caller holds self._refresh_lock
+        started = time.monotonic()
+        try:
+            data = self.fetcher()
+            error = None if self._is_good(data) else "empty snapshot"
+        except Exception as e:
+            data, error = None, f"{type(e).__name__}: {e}"
+        with self._lock:
+            self.stats["last_duration_sec"] = round(time.monotonic() - started, 3)
+            if error is None:
+                self._snapshot = data
+                self._fetched_at = time.monotonic()
+                self.stats["refreshes"] += 1
+                self.stats["last_error"] = None
+            else:
+                self.stats["failures"] += 1
+                self.stats["last_error"] = error
+        return error is None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="market-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def peek(self) -> Optional[dict]:
+        """Last good snapshot plus its age, or None if none exists yet. Never fetches."""
+        with self._lock:
+            snapshot, fetched_at = self._snapshot, self._fetched_at
+        if snapshot is None:
+            return None
+        age = time.monotonic() - fetched_at
+        return {
+            **snapshot,
+            "age_seconds": round(age, 1),
+            "stale": age > 2 * self.interval,
+        }
+
+    def get(self) -> Optional[dict]:
+        """Last good snapshot plus its age; fetches inline only if none exists yet."""
+        data = self.peek()
+        if data is None:
+            with self._refresh_lock:
+                # Another caller (or the background thread) may have filled it
+                if self._snapshot is None:
+                    self._refresh_locked()
+            data = self.peek()
+        return data
+
+    def prime(self):
+        """Start a first fetch on a short-lived thread unless a snapshot exists or a fetch is running."""
+        if self._snapshot is None and not self._refresh_lock.locked():
+            threading.Thread(target=self._prime, name="market-prime", daemon=True).start()
+
+    def _prime(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if self._snapshot is None:
+                self._refresh_locked()
+        finally:
+            self._refresh_lock.release()
+
+    def snapshot_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            has_snapshot = self._snapshot is not None
+            age = time.monotonic() - self._fetched_at if has_snapshot else None
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval_sec": self.interval,
+            "age_seconds": round(age, 1) if age is not None else None,
+            **stats,
+        }
+
+
+_market_refresher = _MarketRefresher(_get_market_live_data, MARKET_REFRESH_SEC)
+
+
+# ---------------------------------------------------------------------------
+# Precomputed payload store
+# ---------------------------------------------------------------------------
+
+
+class _PayloadStore:
+    """Finished JSON payloads keyed by (kind, date, schema_version, as_of).
+
+    Each row also keeps gzip (and brotli, when installed) encodings of the
+    body so a stored payload is served without compressing per request.
+    Lives in a side SQLite file because the screening DB is opened read-only.
+    ``as_of`` is the newest part2 date plus the ticker-info version (see
+    _payload_as_of): screening/stats/exited payloads embed 3-day status and
+    rank history relative to that date, and ticker names and industries, so
+    a new trading day or a ticker-info reload invalidates every stored
+    payload (rebuilt lazily or by ``backfill``).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Caller holds self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                "kind TEXT NOT NULL, date TEXT NOT NULL, "
+                "schema_version INTEGER NOT NULL, as_of TEXT NOT NULL, "
+                "body TEXT NOT NULL, created_at TEXT NOT NULL, "
+                "body_gzip BLOB, body_br BLOB, "
+                "PRIMARY KEY (kind, date, schema_version, as_of))"
+            )
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(payloads)")}
+            for column in ("body_gzip", "body_br"):
+                if column not in columns:  # store created before precompression
+                    conn.execute(f"ALTER TABLE payloads ADD COLUMN {column} BLOB")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    _ENCODING_COLUMNS = {None: "body", "gzip": "body_gzip", "br": "body_br"}
+
+    def get(self, kind: str, date: str, as_of: str, encoding: Optional[str] = None):
+        """The stored body (str), or its *encoding* ("gzip"/"br") as bytes.
+
+        None if the payload is not stored or was too small to precompress.
+        """
+        column = self._ENCODING_COLUMNS[encoding]
+        with self._lock:
+            try:
+                row = self._connection().execute(
+                    f"SELECT {column} FROM payloads "
+                    "WHERE kind = ? AND date = ? AND schema_version = ? AND as_of = ?",
+                    (kind, date, PAYLOAD_SCHEMA_VERSION, as_of),
+                ).fetchone()
+            except sqlite3.Error:
+                self.stats["errors"] += 1
+                return None
+            self.stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def put_many(self, items: list[tuple[str, str, str]], as_of: str):
+        """Store [(kind, date, body), ...] computed against *as_of*."""
+        if not items:
+            return
+        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        rows = []
+        for k, d, b in items:
+            raw = b.encode("utf-8")
+            precompress = len(raw) >= COMPRESS_MIN_SIZE
+            rows.append((
+                k, d, PAYLOAD_SCHEMA_VERSION, as_of, b, now,
+                _compress(raw, "gzip") if precompress else None,
+                _compress(raw, "br") if precompress and brotli is not None else None,
+            ))
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO payloads "
+                    "(kind, date, schema_version, as_of, body, created_at, body_gzip, body_br) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.commit()
+                self.stats["writes"] += len(items)
+            except sqlite3.Error:
+                self.stats["errors"] += 1
+
+    def prune(self, as_of: str) -> int:
+        """Delete payloads built for another schema version or as_of date."""
+        with self._lock:
+            conn = self._connection()
+            cur = conn.execute(
+                "DELETE FROM payloads WHERE schema_version != ? OR as_of != ?",
+                (PAYLOAD_SCHEMA_VERSION, as_of),
+            )
+            conn.commit()
+            return cur.rowcount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"enabled": PAYLOAD_STORE_ENABLED, "path": self.path, **self.stats}
+
+
+_payload_store = _PayloadStore(PAYLOAD_STORE_PATH)
+
+
+def _payload_as_of(latest: str) -> str:
+    """The store's as_of key for payloads built against *latest* and the loaded ticker info."""
+    return f"{latest}|ticker_info:{_ticker_info.version()}"
+
+
+def _storable_as_of(date: str) -> Optional[str]:
+    """The store's as_of key if *date* is a past part2 date, else None (build live)."""
+    if not PAYLOAD_STORE_ENABLED:
+        return None
+    latest = _date_index.latest()
+    if latest is None or date >= latest or not _date_index.contains(date):
+        return None
+    return _payload_as_of(latest)
+
+
+def _payload_body(kind: str, date: str, conn=None, ctx: Optional[dict] = None) -> str:
+    """Serialized per-date payload: from the store for past dates, else built live."""
+    as_of = _storable_as_of(date)
+    if as_of is not None:
+        body = _payload_store.get(kind, date, as_of)
+        if body is not None:
+            return body
+    body = _dump_payload(_PAYLOAD_BUILDERS[kind](date, conn, ctx))
+    if as_of is not None:
+        _payload_store.put_many([(kind, date, body)], as_of)
+    return body
+
+
+def _serve_date_payload(kind: str, date: str, request: Request):
+    """Serve a per-date payload, from the store when *date* is a past part2 date.
+
+    Stored payloads go out precompressed when the client accepts it. The
+    newest date (and unknown dates) are always built live.
+    """
+    encoding = _accepted_encoding(request.headers.get("accept-encoding", ""))
+    as_of = _storable_as_of(date)
+    if encoding is not None and as_of is not None:
+        blob = _payload_store.get(kind, date, as_of, encoding)
+        if blob is not None:
+            return Response(
+                content=blob,
+                media_type="application/json",
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+    return Response(content=_payload_body(kind, date), media_type="application/json")
+
+
+# ---------------------------------------------------------------------------
+# HTTP conditional caching (ETag / Cache-Control)
+# ---------------------------------------------------------------------------
+
+# Responses that are a pure function of the DB contents + the path
+_CONDITIONAL_DATE_ROUTE = re.compile(r"^/api/(screening|stats|exited|portfolio)/(\d{4}-\d{2}-\d{2})$")
+# Per-date payloads that never change once the date is past. screening, stats
+# and exited embed 3-day status / rank history relative to the newest date
+# (see _PayloadStore), so they change with every trading day and always revalidate.
+_IMMUTABLE_DATE_KINDS = frozenset({"portfolio"})
+_CONDITIONAL_TICKER_ROUTE = re.compile(r"^/api/ticker/([^/]+)$")
+
+
+def _etag_for(path: str) -> Optional[str]:
+    """Weak ETag from the DB file and ticker-info versions, payload schema and request path + query.
+
+    Computed from os.stat() alone, so a matching If-None-Match is answered
+    before any query runs. Weak because gzip may change the bytes.
+    """
+    version = _db_file_version()
+    if version is None:
+        return None
+    digest = hashlib.sha1(
+        f"{version}|{_ticker_info.version()}|{PAYLOAD_SCHEMA_VERSION}|{path}".encode("utf-8")
+    ).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _cache_control_for(path: str) -> str:
+    """Long max-age for immutable past-date payloads; revalidate-every-time (ETag) otherwise."""
+    m = _CONDITIONAL_DATE_ROUTE.match(path)
+    if m and m.group(1) in _IMMUTABLE_DATE_KINDS:
+        date = m.group(2)
+        latest = _date_index.latest()
+        if latest is not None and date < latest and _date_index.contains(date):
+            return f"public, max-age={HTTP_PAST_MAX_AGE}"
+    return "no-cache"
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """ETag + If-None-Match (304) + Cache-Control for DB-derived GET routes."""
+    path = request.url.path
+    if request.method not in ("GET", "HEAD") or not (
+        _CONDITIONAL_DATE_ROUTE.match(path) or _CONDITIONAL_TICKER_ROUTE.match(path)
+    ):
+        return await call_next(request)
+
+    etag = _etag_for(f"{path}?{request.url.query}" if request.url.query else path)
+    if etag is None:
+        return await call_next(request)
+    cache_control = _cache_control_for(path)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+
+# Added last so it wraps everything above, conditional_get included
+app.add_middleware(_MetricsMiddleware)
+
+
+# ---------------------------------------------------------------------------
+# Request executors
+# ---------------------------------------------------------------------------
+
+
+class _RequestExecutor:
+    """Bounded thread pool that async handlers hand their blocking work to.
+
+    SQLite work and upstream network waits run on separate instances, so a
+    stuck FRED/yfinance fetch can only tie up network threads while DB-only
+    endpoints keep their whole pool. At most *max_pending* calls may be
+    queued or running (0 = unbounded); past that a request fails fast with
+    503 instead of piling up. Calls run in a copy of the caller's context,
+    like Starlette's run_in_threadpool. Streaming bodies live as long as the
+    client keeps reading, so they are admitted separately: at most
+    *max_streams* at once (0 = unbounded).
+    """
+
+    def __init__(self, name: str, workers: int, max_pending: int, max_streams: int = 0):
+        self.name = name
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.max_streams = max_streams
+        self._streams = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"{name}-exec")
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._active = 0
+        self.stats = {
+            "submitted": 0, "completed": 0, "errors": 0, "rejected": 0,
+            "max_queue_depth": 0, "queue_wait_ms_total": 0.0, "streams_rejected": 0,
+        }
+
+    def _call(self, enqueued: float, fn, args, kwargs):
+        with self._lock:
+            self._active += 1
+            self.stats["queue_wait_ms_total"] += (time.monotonic() - enqueued) * 1000
+        try:
+            return fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.stats["completed"] += 1
+
+    def _done(self, _fut):
+        # Also runs for calls cancelled before they started
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, args=(), kwargs=None, bounded: bool = True):
+        with self._lock:
+            if bounded and self.max_pending > 0 and self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise HTTPException(status_code=503, detail=f"Server busy ({self.name} queue full)")
+            self._pending += 1
+            self.stats["submitted"] += 1
+            depth = self._pending - self._active
+            if depth > self.stats["max_queue_depth"]:
+                self.stats["max_queue_depth"] = depth
+        ctx = contextvars.copy_context()
+        fut = self._executor.submit(ctx.run, self._call, time.monotonic(), fn, args, kwargs or {})
+        fut.add_done_callback(self._done)
+        return fut
+
+    async def run(self, fn, *args, **kwargs):
+        """Run blocking *fn* on this pool and await its result."""
+        return await asyncio.wrap_future(self._submit(fn, args, kwargs))
+
+    def endpoint(self, fn):
+        """Decorator: serve a blocking route handler as an async one on this pool."""
+        @wraps(fn)
+        async def handler(*args, **kwargs):
+            return await self.run(fn, *args, **kwargs)
+        return handler
+
+    def iterate(self, iterator):
+        """Admit a streaming body and return an async view of a blocking iterator.
+
+        Raises 503 (before any response starts) past max_streams open
+        streams. Each next() runs on this pool; admitted streams are not
+        subject to max_pending. The slot is freed when the stream ends, is
+        closed early (client gone) or is dropped without ever starting.
+        """
+        with self._lock:
+            if self.max_streams > 0 and self._streams >= self.max_streams:
+                self.stats["streams_rejected"] += 1
+                raise HTTPException(status_code=503, detail=f"Server busy ({self.name} stream limit)")
+            self._streams += 1
+        slot = [1]
+
+        def release():
+            with self._lock:
+                if slot:
+                    slot.pop()
+                    self._streams -= 1
+
+        stream = self._iterate(iterator, release)
+        weakref.finalize(stream, release)
+        return stream
+
+    async def _iterate(self, iterator, release: Callable[[], None]):
+        # On early exit the iterator is closed once any in-flight next() has
+        # returned, so it can release whatever it holds (e.g. a connection).
+        it = iter(iterator)
+        end = object()
+        fut = None
+        try:
+            while True:
+                fut = self._submit(next, (it, end), bounded=False)
+                item = await asyncio.wrap_future(fut)
+                if item is end:
+                    return
+                yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                if fut is not None and not fut.done():
+                    fut.add_done_callback(lambda _: close())
+                else:
+                    close()
+            release()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            active, queued, streams = self._active, self._pending - self._active, self._streams
+        stats["queue_wait_ms_total"] = round(stats["queue_wait_ms_total"], 1)
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "active": active,
+            "queue_depth": queued,
+            "streams": streams,
+            "max_streams": self.max_streams,
+            **stats,
+        }
+
 
-    return {
-        "indices": indices,
-        "hy": hy,
-        "vix": vix,
-        "concordance": conc["concordance"],
-        "signal_dots": conc["signal_dots"],
-        "final_action": conc["final_action"],
-        "portfolio_mode": conc["portfolio_mode"],
-        "cached_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
-    }
+_db_executor = _RequestExecutor("db", DB_EXECUTOR_WORKERS, DB_EXECUTOR_QUEUE, STREAM_MAX_OPEN)
+_net_executor = _RequestExecutor("net", NET_EXECUTOR_WORKERS, NET_EXECUTOR_QUEUE)
 
 
 # ---------------------------------------------------------------------------
@@ -858,29 +3075,82 @@ def _get_market_live_data() -> dict:
 
 
 @app.get("/api/health")
+@_db_executor.endpoint
 def health():
     """Health check."""
     db_exists = os.path.isfile(DB_PATH)
-    ticker_cache_loaded = len(TICKER_CACHE) > 0
+    ticker_info = _ticker_info.snapshot()
     return {
         "status": "ok",
         "db_exists": db_exists,
         "db_path": DB_PATH,
-        "ticker_cache_count": len(TICKER_CACHE),
-        "ticker_cache_loaded": ticker_cache_loaded,
+        "ticker_cache_count": ticker_info["count"],
+        "ticker_cache_loaded": ticker_info["count"] > 0,
+        "ticker_info": ticker_info,
+        "db_pool": _db_pool.snapshot(),
+        "payload_store": _payload_store.snapshot(),
+        "cache": _cache.snapshot(),
+        "market_refresher": _market_refresher.snapshot_stats(),
+        "market_store": _series_store.snapshot(),
+        "rolling": {"hy": dict(_hy_rolling.stats), "vix": dict(_vix_rolling.stats)},
+        "db_query_plans": dict(_db_maintenance) or None,
+        "date_index": _date_index.snapshot(),
+        "portfolio_analytics": _portfolio_analytics.snapshot(),
+        "schema": _schema.snapshot(),
+        "executors": {"db": _db_executor.snapshot(), "net": _net_executor.snapshot()},
     }
 
 
+def _collected_metrics() -> tuple:
+    """Gauges and counters kept by the cache, DB pool and executors, read at scrape time."""
+    cache = _cache.snapshot()
+    pool = _db_pool.snapshot()
+    executors = {"db": _db_executor.snapshot(), "net": _net_executor.snapshot()}
+
+    def per_pool(key):
+        return [((("pool", name),), snap[key]) for name, snap in executors.items()]
+
+    return (
+        ("eps_cache_lookups_total", "counter", "cached() lookups by result (coalesced = waited on a concurrent miss).",
+         [((("result", result),), cache[key])
+          for result, key in (("hit", "hits"), ("coalesced", "coalesced"), ("miss", "misses"))]),
+        ("eps_cache_evictions_total", "counter", "cached() entries dropped by the LRU bound or TTL.",
+         [((("reason", "lru"),), cache["evictions"]), ((("reason", "ttl"),), cache["expirations"])]),
+        ("eps_cache_entries", "gauge", "Entries held by the cached() layer.", [((), cache["entries"])]),
+        ("eps_db_pool_connections", "gauge", "Pooled SQLite connections by state.",
+         [((("state", "in_use"),), pool["in_use"]), ((("state", "idle"),), pool["idle"])]),
+        ("eps_db_pool_waits_total", "counter", "Checkouts that waited for a free connection.", [((), pool["waits"])]),
+        ("eps_db_pool_timeouts_total", "counter", "Checkouts that timed out.", [((), pool["timeouts"])]),
+        ("eps_executor_workers", "gauge", "Threads per request executor.", per_pool("workers")),
+        ("eps_executor_active", "gauge", "Calls running per request executor.", per_pool("active")),
+        ("eps_executor_queue_depth", "gauge", "Calls waiting for a thread per request executor.",
+         per_pool("queue_depth")),
+        ("eps_executor_rejected_total", "counter", "Requests refused with 503 because the queue was full.",
+         per_pool("rejected")),
+        ("eps_executor_streams", "gauge", "Streaming bodies open per request executor.", per_pool("streams")),
+        ("eps_executor_streams_rejected_total", "counter", "Streams refused with 503 at the stream limit.",
+         per_pool("streams_rejected")),
+    )
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Prometheus text exposition of request, SQLite, cache and upstream-fetch metrics.
+
+    In-memory only, so it is served on the event loop and stays responsive
+    when the executors are saturated.
+    """
+    return Response(
+        content=_metrics.render(_collected_metrics()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/api/dates")
+@_db_executor.endpoint
 def list_dates():
     """List all available dates (those with part2_rank data), newest first."""
-    with get_db() as conn:
-        cur = conn.execute(
-            "SELECT DISTINCT date FROM ntm_screening "
-            "WHERE part2_rank IS NOT NULL "
-            "ORDER BY date DESC"
-        )
-        return [r["date"] for r in cur.fetchall()]
+    return _date_index.all_desc()
 
 
 # ---------------------------------------------------------------------------
@@ -889,12 +3159,17 @@ def list_dates():
 
 
 @app.get("/api/market/live")
+@_net_executor.endpoint
 def get_market_live():
     """Live market status — HY Spread, VIX, indices, concordance.
 
-    Cached for 1 hour (3600 seconds).
+    Served from the background refresher's last good snapshot (refreshed
+    every EPS_MARKET_REFRESH_SEC, default 1 hour); includes age_seconds.
     """
-    return cached("market_live", 3600, _get_market_live_data)
+    data = _market_refresher.get()
+    if data is None:
+        raise HTTPException(status_code=503, detail="Market data unavailable")
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -903,147 +3178,246 @@ def get_market_live():
 
 
 @app.get("/api/screening/{date}")
-def get_screening(date: str):
+@_db_executor.endpoint
+def get_screening(date: str, request: Request):
     """Top 30 candidates for a specific date, enriched with segments, status,
-    ticker info, risk flags, and computed metrics."""
-    with get_db() as conn:
-        cols = _get_columns(conn, "ntm_screening")
-        # Base columns always present
-        select_cols = [
-            "ticker", "part2_rank", "score", "adj_score", "adj_gap",
-            "price", "ma60", "ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d",
-            "rev_up30", "rev_down30", "num_analysts", "is_turnaround",
-        ]
-        # Optional columns (may not exist in older DBs)
-        optional = [
-            "composite_rank", "rev_growth", "market_cap", "roe",
-            "debt_to_equity", "operating_margin", "free_cashflow", "beta",
-        ]
-        for c in optional:
-            if c in cols:
-                select_cols.append(c)
-        # Fetch rows for the requested date
-        cur = conn.execute(
-            f"SELECT {','.join(select_cols)} "
+    ticker info, risk flags, and computed metrics.
+
+    Past dates are served from the precomputed payload store.
+    """
+    return _serve_date_payload("screening", date, request)
+
+
+# Base columns always present
+_SCREENING_COLUMNS = [
+    "ticker", "part2_rank", "score", "adj_score", "adj_gap",
+    "price", "ma60", "ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d",
+    "rev_up30", "rev_down30", "num_analysts", "is_turnaround",
+]
+# Optional columns (may not exist in older DBs)
+_SCREENING_OPTIONAL = [
+    "composite_rank", "rev_growth", "market_cap", "roe",
+    "debt_to_equity", "operating_margin", "free_cashflow", "beta",
+]
+
+
+def _build_screening_payload(date: str, conn=None, ctx: Optional[dict] = None):
+    """Build the /api/screening/{date} payload (uncached)."""
+    with _use_db(conn) as conn:
+        sql = _schema.sql(conn, "screening_top30", lambda: (
+            f"SELECT {','.join(_SCREENING_COLUMNS + _schema.present(conn, 'ntm_screening', _SCREENING_OPTIONAL))} "
             "FROM ntm_screening WHERE date = ? AND part2_rank IS NOT NULL "
-            "ORDER BY part2_rank ASC",
-            (date,),
-        )
+            "ORDER BY part2_rank ASC"
+        ))
+        # Fetch rows for the requested date
+        cur = conn.execute(sql, (date,))
         rows = rows_to_dicts(cur.fetchall())
         if not rows:
             return []
 
-        # 3-day status context
-        last3 = _get_last_n_part2_dates(conn, 3)
-        td_map = _build_ticker_dates_map(conn, last3)
+        # 3-day status context — one batched query for every Top-30 ticker
+        top30_tickers = [r["ticker"] for r in rows]
+        top30 = _top30_context(conn, date, ctx, top30_tickers)
+        last3, rank_ctx, td_map = top30["last3"], top30["rank_ctx"], top30["td_map"]
 
-        for row in rows:
-            # Segments
-            ntm_current = row.get("ntm_current") or 0
-            ntm_7d = row.get("ntm_7d") or 0
-            ntm_30d = row.get("ntm_30d") or 0
-            ntm_60d = row.get("ntm_60d") or 0
-            ntm_90d = row.get("ntm_90d") or 0
+        # Segments, trend, EPS change, fwd P/E, risk flags — one columnar pass
+        enriched = _enrich_columns(rows)
+        infos = _ticker_info.get_many(top30_tickers)
 
-            seg1, seg2, seg3, seg4 = calc_segments(
-                ntm_current, ntm_7d, ntm_30d, ntm_60d, ntm_90d,
-            )
-            row["seg1"] = round(seg1, 2)
-            row["seg2"] = round(seg2, 2)
-            row["seg3"] = round(seg3, 2)
-            row["seg4"] = round(seg4, 2)
-
-            # Trend icons (seg4 -> seg1 = past -> present)
-            row["trend"] = (
-                trend_icon(seg4) + trend_icon(seg3) + trend_icon(seg2) + trend_icon(seg1)
-            )
+        for i, row in enumerate(rows):
+            row["seg1"] = enriched["seg1"][i]
+            row["seg2"] = enriched["seg2"][i]
+            row["seg3"] = enriched["seg3"][i]
+            row["seg4"] = enriched["seg4"][i]
+            row["trend"] = enriched["trend"][i]
 
             # 3-day verification status
             row["status_3d"] = _compute_3day_status(row["ticker"], last3, td_map)
 
             # Rank history (aligned with status marker)
-            row["rank_history"] = _build_rank_history(row["ticker"], last3, conn, row["status_3d"])
-
-            # --- NEW: Ticker info from cache ---
-            info = _get_ticker_info(row["ticker"])
-            row["short_name"] = info["short_name"]
-            row["industry_en"] = info["industry_en"]
-            row["industry_kr"] = info["industry_kr"]
+            ticker_ctx = rank_ctx.get(row["ticker"], {})
+            row["rank_history"] = _build_rank_history(last3, ticker_ctx, row["status_3d"])
 
-            # --- NEW: EPS change 90d ---
-            if ntm_90d != 0:
-                row["eps_change_90d"] = round(((ntm_current - ntm_90d) / abs(ntm_90d)) * 100, 2)
-            else:
-                row["eps_change_90d"] = None
-
-            # --- NEW: Forward P/E ---
-            price = row.get("price") or 0
-            if ntm_current > 0:
-                row["fwd_pe"] = round(price / ntm_current, 2)
-            else:
-                row["fwd_pe"] = None
+            info = infos[row["ticker"]]
+            row["short_name"] = info.short_name
+            row["industry_en"] = info.industry_en
+            row["industry_kr"] = info.industry_kr
 
-            # --- NEW: Risk flags ---
-            row["risk_flags"] = _compute_risk_flags(row)
+            row["eps_change_90d"] = enriched["eps_change_90d"][i]
+            row["fwd_pe"] = enriched["fwd_pe"][i]
+            row["risk_flags"] = enriched["risk_flags"][i]
 
             # --- Rank change tags (v36.6) ---
-            row["rank_change_tag"] = _compute_rank_change_tags(row["ticker"], last3, conn)
+            row["rank_change_tag"] = _compute_rank_change_tags(last3, ticker_ctx)
 
-            # Convert rev_growth from ratio (0.612) to percent (61.2)
-            rg = row.get("rev_growth")
-            if rg is not None:
-                row["rev_growth"] = round(rg * 100, 1)
+            # rev_growth as percent (0.612 -> 61.2)
+            if "rev_growth" in row:
+                row["rev_growth"] = enriched["rev_growth"][i]
 
         return rows
 
 
 # ---------------------------------------------------------------------------
-# Portfolio endpoints
+# Dashboard bundle endpoint
 # ---------------------------------------------------------------------------
 
 
-@app.get("/api/portfolio/{date}")
-def get_portfolio(date: str):
-    """Portfolio log entries for a specific date, enriched with ticker info."""
+def _dashboard_sections(date: str) -> tuple[str, str, str, str]:
+    """Serialized screening, stats, portfolio and exited sections for one date."""
+    ctx: dict = {}
     with get_db() as conn:
-        cur = conn.execute(
-            "SELECT date, ticker, action, price, weight, "
-            "entry_date, entry_price, exit_price, return_pct "
-            "FROM portfolio_log WHERE date = ? ORDER BY ticker",
-            (date,),
-        )
+        screening = _payload_body("screening", date, conn, ctx)
+        stats = _payload_body("stats", date, conn, ctx)
+        portfolio = _dump_payload(_build_portfolio_payload(date, conn))
+        exited = _payload_body("exited", date, conn, ctx)
+    return screening, stats, portfolio, exited
+
+
+@app.get("/api/dashboard/{date}")
+async def get_dashboard(date: str):
+    """Everything the dashboard page needs for one date in a single response:
+    screening, stats, portfolio, exited and market.
+
+    All sections share one connection and one per-date Top-30 context; past
+    dates reuse stored section payloads verbatim. market is the refresher's
+    last snapshot and never waits on a fetch: it is null until the first
+    one completes (one is started in the background), and the client then
+    falls back to /api/market/live.
+    """
+    market = _market_refresher.peek()
+    if market is None:
+        _market_refresher.prime()
+    screening, stats, portfolio, exited = await _db_executor.run(_dashboard_sections, date)
+
+    body = (
+        f'{{"date":{_dump_payload(date)},"screening":{screening},"stats":{stats},'
+        f'"portfolio":{portfolio},"exited":{exited},"market":{_dump_payload(market)}}}'
+    )
+    return Response(content=body, media_type="application/json")
+
+
+# ---------------------------------------------------------------------------
+# Portfolio endpoints
+# ---------------------------------------------------------------------------
+
+
+_PORTFOLIO_LOG_SELECT = (
+    "SELECT date, ticker, action, price, weight, "
+    "entry_date, entry_price, exit_price, return_pct "
+    "FROM portfolio_log"
+)
+
+
+def _build_portfolio_payload(date: str, conn=None):
+    """Build the /api/portfolio/{date} payload."""
+    with _use_db(conn) as conn:
+        cur = conn.execute(_PORTFOLIO_LOG_SELECT + " WHERE date = ? ORDER BY ticker", (date,))
         rows = rows_to_dicts(cur.fetchall())
 
+    infos = _ticker_info.get_many({row["ticker"] for row in rows})
     for row in rows:
-        info = _get_ticker_info(row["ticker"])
-        row["short_name"] = info["short_name"]
-        row["industry_kr"] = info["industry_kr"]
+        info = infos[row["ticker"]]
+        row["short_name"] = info.short_name
+        row["industry_kr"] = info.industry_kr
 
     return rows
 
 
+def _stream_rows(sql: str, params=()):
+    """Yield lists of row dicts, STREAM_FETCH_ROWS at a time, from one cursor.
+
+    Uses its own unpooled connection: a stream lasts as long as the client
+    keeps reading, and must not hold a pool slot that normal requests need.
+    """
+    conn = _db_pool.open_unpooled()
+    try:
+        cur = conn.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(STREAM_FETCH_ROWS)
+            if not rows:
+                return
+            yield rows_to_dicts(rows)
+    finally:
+        conn.close()
+
+
+def _portfolio_history_groups():
+    """(date, entries) pairs, newest date first, with ticker info — one group held at a time."""
+    ticker_info = _ticker_info.resolver()
+    date, group = None, []
+    for batch in _stream_rows(_PORTFOLIO_LOG_SELECT + " ORDER BY date DESC, ticker"):
+        for r in batch:
+            if r["date"] != date:
+                if group:
+                    yield date, group
+                date, group = r["date"], []
+            info = ticker_info(r["ticker"])
+            r["short_name"] = info.short_name
+            r["industry_kr"] = info.industry_kr
+            group.append(r)
+    if group:
+        yield date, group
+
+
+def _ndjson_or_chunked(fmt: str, items, open_: str, close: str):
+    """Serialize an iterator of JSON fragments as NDJSON lines or one chunked JSON document.
+
+    *items* yields (ndjson_line_payload, json_fragment) pairs; json
+    fragments are joined with commas between *open_* and *close*.
+    """
+    if fmt == "ndjson":
+        for line, _ in items:
+            yield (_dump_payload(line) + "\n").encode("utf-8")
+        return
+    yield open_.encode("utf-8")
+    first = True
+    for _, fragment in items:
+        yield (fragment if first else "," + fragment).encode("utf-8")
+        first = False
+    yield close.encode("utf-8")
+
+
+_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+
 @app.get("/api/portfolio/history")
+@_db_executor.endpoint
 def get_portfolio_history():
     """Full portfolio history grouped by date."""
     with get_db() as conn:
-        cur = conn.execute(
-            "SELECT date, ticker, action, price, weight, "
-            "entry_date, entry_price, exit_price, return_pct "
-            "FROM portfolio_log ORDER BY date DESC, ticker"
-        )
+        cur = conn.execute(_PORTFOLIO_LOG_SELECT + " ORDER BY date DESC, ticker")
         rows = rows_to_dicts(cur.fetchall())
 
     # Group by date
     grouped: dict[str, list] = {}
+    infos = _ticker_info.get_many({r["ticker"] for r in rows})
     for r in rows:
-        info = _get_ticker_info(r["ticker"])
-        r["short_name"] = info["short_name"]
-        r["industry_kr"] = info["industry_kr"]
+        info = infos[r["ticker"]]
+        r["short_name"] = info.short_name
+        r["industry_kr"] = info.industry_kr
         grouped.setdefault(r["date"], []).append(r)
     return grouped
 
 
+@app.get("/api/portfolio/history/stream")
+@_db_executor.endpoint
+def stream_portfolio_history(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|json)$")):
+    """/api/portfolio/history streamed one date group at a time.
+
+    format=ndjson: one {"date", "entries"} object per line, newest first.
+    format=json: the same document as /api/portfolio/history, sent in chunks.
+    """
+    items = (
+        ({"date": date, "entries": entries}, f"{_dump_payload(date)}:{_dump_payload(entries)}")
+        for date, entries in _portfolio_history_groups()
+    )
+    return StreamingResponse(
+        _db_executor.iterate(_ndjson_or_chunked(fmt, items, "{", "}")), media_type=_STREAM_MEDIA_TYPES[fmt],
+    )
+
+
 @app.get("/api/portfolio/performance")
+@_db_executor.endpoint
 def get_portfolio_performance():
     """Aggregate portfolio performance metrics from completed (exit) trades."""
     with get_db() as conn:
@@ -1112,11 +3486,11 @@ def get_portfolio_performance():
 
     # Simplified trade list for charts
     trades_summary = []
+    infos = _ticker_info.get_many({e["ticker"] for e in exits})
     for e in exits:
-        info = _get_ticker_info(e["ticker"])
         trades_summary.append({
             "ticker": e["ticker"],
-            "short_name": info["short_name"],
+            "short_name": infos[e["ticker"]].short_name,
             "return_pct": e["return_pct"],
             "entry_date": e["entry_date"],
             "exit_date": e["exit_date"],
@@ -1136,67 +3510,406 @@ def get_portfolio_performance():
     }
 
 
+class _PortfolioAnalytics:
+    """Daily equity curve and risk metrics over portfolio_log, extended incrementally.
+
+    Day t's return is sum(weight * (price_t / price_t-1 - 1)) over positions
+    held from the previous portfolio date (enter/hold) into t (hold/exit);
+    the rest of the book is cash. Marks use ntm_screening prices, falling
+    back to portfolio_log.price. Only dates after the last processed one
+    are fetched and appended (returns, equity, peak and running moments);
+    a rewrite of already-processed rows triggers a full rebuild.
+    """
+
+    PERIODS_PER_YEAR = 252
+    WIN_RATE_WINDOW = 20  # exit trades per rolling win-rate point
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"rebuilds": 0, "appends": 0, "hits": 0}
+        self._reset()
+
+    def _reset(self):
+        self._dates: list[str] = []
+        self._returns = np.empty(0)
+        self._equity = np.empty(0)
+        self._peak = np.empty(0)
+        self._positions: dict[str, tuple[float, float]] = {}  # ticker -> (weight, mark)
+        self._rows_through = 0  # portfolio_log rows with date <= self._dates[-1]
+        # Running moments of daily returns (first day excluded: nothing held yet)
+        self._n = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._down_sumsq = 0.0
+        self._recent_wins: deque = deque(maxlen=self.WIN_RATE_WINDOW)
+        self._rolling_win_rate: list[dict] = []
+        self._result: Optional[dict] = None
+
+    def _append(self, rows: list[dict]):
+        """Extend the series with rows (ordered by date, ticker) for dates after the last one."""
+        base = len(self._dates)
+        new_dates: list[str] = []
+        day_idx, weights, prev_marks, marks = [], [], [], []
+        i = 0
+        while i < len(rows):
+            date = rows[i]["date"]
+            j = i
+            while j < len(rows) and rows[j]["date"] == date:
+                j += 1
+            k = len(new_dates)
+            new_dates.append(date)
+            held, positions = self._positions, {}
+            for r in rows[i:j]:
+                action, ticker, price = r["action"], r["ticker"], r["price"]
+                if action in ("hold", "exit") and ticker in held and price:
+                    w, prev = held[ticker]
+                    if prev:
+                        day_idx.append(k)
+                        weights.append(w)
+                        prev_marks.append(prev)
+                        marks.append(price)
+                if action in ("enter", "hold"):
+                    positions[ticker] = (r["weight"] or 0.0, price)
+                elif action == "exit" and r["return_pct"] is not None:
+                    self._recent_wins.append(r["return_pct"] > 0)
+                    point = {
+                        "date": date,
+                        "win_rate": round(sum(self._recent_wins) / len(self._recent_wins) * 100, 1),
+                        "trades": len(self._recent_wins),
+                    }
+                    if self._rolling_win_rate and self._rolling_win_rate[-1]["date"] == date:
+                        self._rolling_win_rate[-1] = point
+                    else:
+                        self._rolling_win_rate.append(point)
+            self._positions = positions
+            i = j
+        if not new_dates:
+            return
+
+        contrib = np.asarray(weights) * (np.asarray(marks) / np.asarray(prev_marks) - 1.0)
+        returns = np.bincount(np.asarray(day_idx, dtype=np.int64), weights=contrib, minlength=len(new_dates))
+        returns = returns[:len(new_dates)].astype(np.float64)
+
+        start_equity = self._equity[-1] if base else 1.0
+        start_peak = self._peak[-1] if base else 1.0
+        equity = start_equity * np.cumprod(1.0 + returns)
+        peak = np.maximum.accumulate(np.maximum(equity, start_peak))
+
+        counted = returns if base else returns[1:]
+        self._n += len(counted)
+        self._sum += float(counted.sum())
+        self._sumsq += float(np.square(counted).sum())
+        self._down_sumsq += float(np.square(np.minimum(counted, 0.0)).sum())
+
+        self._dates.extend(new_dates)
+        self._returns = np.concatenate([self._returns, returns])
+        self._equity = np.concatenate([self._equity, equity])
+        self._peak = np.concatenate([self._peak, peak])
+        self._result = None
+
+    def _build_result(self) -> dict:
+        n = self._n
+        ann = math.sqrt(self.PERIODS_PER_YEAR)
+        mean = self._sum / n if n else None
+        std = math.sqrt(max(self._sumsq - self._sum * self._sum / n, 0.0) / (n - 1)) if n > 1 else None
+        downside = math.sqrt(self._down_sumsq / n) if n else None
+        drawdown = self._equity / self._peak - 1.0 if self._dates else np.empty(0)
+
+        def ratio(num, den):
+            return round(num / den * ann, 2) if num is not None and den else None
+
+        return {
+            "as_of": self._dates[-1] if self._dates else None,
+            "days": len(self._dates),
+            "total_return_pct": round(float(self._equity[-1] - 1.0) * 100, 2) if self._dates else None,
+            "max_drawdown_pct": round(float(drawdown.min()) * 100, 2) if self._dates else None,
+            "volatility_pct": round(std * ann * 100, 2) if std is not None else None,
+            "sharpe": ratio(mean, std),
+            "sortino": ratio(mean, downside),
+            "win_rate_window": self.WIN_RATE_WINDOW,
+            "equity_curve": [
+                {"date": d, "equity": round(e, 4), "daily_return_pct": round(r * 100, 3), "drawdown_pct": round(dd * 100, 2)}
+                for d, e, r, dd in zip(
+                    self._dates, self._equity.tolist(), self._returns.tolist(), drawdown.tolist()
+                )
+            ],
+            "rolling_win_rate": list(self._rolling_win_rate),
+        }
+
+    def get(self) -> dict:
+        """Analytics through the latest portfolio_log date (memoized on that date)."""
+        with get_db() as conn, self._lock:
+            latest = conn.execute("SELECT MAX(date) FROM portfolio_log").fetchone()[0]
+            last = self._dates[-1] if self._dates else None
+            if last is not None:
+                rows_through = conn.execute(
+                    "SELECT COUNT(*) FROM portfolio_log WHERE date <= ?", (last,)
+                ).fetchone()[0]
+                if latest is None or latest < last or rows_through != self._rows_through:
+                    self._reset()
+                    self.stats["rebuilds"] += 1
+                    last = None
+                elif latest == last and self._result is not None:
+                    self.stats["hits"] += 1
+                    return self._result
+            if latest is not None and latest != last:
+                cur = conn.execute(
+                    "SELECT p.date, p.ticker, p.action, p.weight, p.return_pct, "
+                    "COALESCE(s.price, p.price) AS price "
+                    "FROM portfolio_log p "
+                    "LEFT JOIN ntm_screening s ON s.date = p.date AND s.ticker = p.ticker "
+                    + ("WHERE p.date > ? " if last is not None else "")
+                    + "ORDER BY p.date, p.ticker",
+                    (last,) if last is not None else (),
+                )
+                rows = rows_to_dicts(cur.fetchall())
+                self._append(rows)
+                self._rows_through += len(rows)
+                self.stats["appends"] += 1
+            if self._result is None:
+                self._result = self._build_result()
+            return self._result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"days": len(self._dates), "as_of": self._dates[-1] if self._dates else None, **self.stats}
+
+
+_portfolio_analytics = _PortfolioAnalytics()
+
+
+@app.get("/api/portfolio/analytics")
+@_db_executor.endpoint
+def get_portfolio_analytics():
+    """Daily equity curve, drawdown, volatility, Sharpe/Sortino and rolling win rate.
+
+    Memoized on the latest portfolio_log date; new dates are appended
+    incrementally.
+    """
+    return _portfolio_analytics.get()
+
+
+# Declared after the fixed /api/portfolio/* paths so it does not capture them
+@app.get("/api/portfolio/{date}")
+@_db_executor.endpoint
+def get_portfolio(date: str):
+    """Portfolio log entries for a specific date, enriched with ticker info."""
+    return _build_portfolio_payload(date)
+
 # ---------------------------------------------------------------------------
 # Ticker detail endpoint (enhanced)
 # ---------------------------------------------------------------------------
 
 
-@app.get("/api/ticker/{ticker}")
-def get_ticker_history(ticker: str):
-    """Historical screening data for a single ticker, enriched with ticker info."""
-    ticker_upper = ticker.upper()
-    info = _get_ticker_info(ticker_upper)
+# Projectable /api/ticker columns; optional ones are dropped on older DBs
+_TICKER_HISTORY_COLUMNS = [
+    "date", "score", "adj_score", "adj_gap", "price", "ma60",
+    "ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d",
+    "part2_rank", "rev_up30", "rev_down30", "num_analysts",
+]
+_TICKER_HISTORY_OPTIONAL = ["composite_rank", "rev_growth"]
+_TICKER_HISTORY_ORDER = {c: i for i, c in enumerate(_TICKER_HISTORY_COLUMNS + _TICKER_HISTORY_OPTIONAL)}
+_SEGMENT_FIELDS = ["seg1", "seg2", "seg3", "seg4"]
+_SEGMENT_INPUTS = ["ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d"]
+
 
+def _lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of *threshold* points that keep the shape of (x, y).
+
+    First and last points are always kept. Bucket selection is sequential
+    (each pick depends on the previous one) but every bucket's triangle
+    areas are one vectorized NumPy expression, so the Python loop is
+    O(threshold), independent of the series length. NaN y values are
+    never picked unless a whole bucket is NaN.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 middle buckets; bucket k = [edges[k], edges[k+1]), edges[-1] == n - 1
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    y_filled = np.where(np.isnan(y), 0.0, y)
+
+    # Average of each bucket (used as the third triangle vertex); last = final point
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y_filled)))
+    sizes = edges[1:] - edges[:-1]
+    avg_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / sizes, x[-1])
+    avg_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / sizes, y_filled[-1])
+
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for k in range(threshold - 2):
+        lo, hi = edges[k], edges[k + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[k + 1]) * (by - y_filled[a]) - (x[a] - bx) * (avg_y[k + 1] - y_filled[a]))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + int(np.argmax(area))
+        picked[k + 1] = a
+    return picked
+
+
+def _ticker_history_sql(conn, ticker: str, select_cols: list[str], start: Optional[str], end: Optional[str]):
+    """(sql, params) for one ticker's rows in [start, end]; the SQL is memoized per shape.
+
+    Columns are selected in canonical history order whatever order
+    *select_cols* comes in, so each column set has one memo entry.
+    """
+    select_cols = sorted(set(select_cols), key=_TICKER_HISTORY_ORDER.__getitem__)
+    where, params = _date_range_where(start, end)
+    name = f"ticker_history:{','.join(select_cols)}:{bool(start)}:{bool(end)}"
+    sql = _schema.sql(conn, name, lambda: (
+        f"SELECT {','.join(select_cols)} FROM ntm_screening "
+        f"WHERE {' AND '.join(['ticker = ?'] + where)} ORDER BY date"
+    ))
+    return sql, [ticker] + params
+
+
+def _ticker_history_rows(
+    ticker: str,
+    start: Optional[str],
+    end: Optional[str],
+    fields: Optional[list[str]],
+    points: Optional[int],
+    metric: str,
+) -> list[dict]:
+    """Rows of one ticker's history in [start, end], projected and optionally LTTB-downsampled."""
     with get_db() as conn:
-        cols = _get_columns(conn, "ntm_screening")
-        select_cols = ["date", "score", "adj_score", "adj_gap", "price", "ma60",
-                       "ntm_current", "ntm_7d", "ntm_30d", "ntm_60d", "ntm_90d",
-                       "part2_rank", "rev_up30", "rev_down30", "num_analysts"]
-        for c in ["composite_rank", "rev_growth"]:
-            if c in cols:
-                select_cols.append(c)
-        cur = conn.execute(
-            f"SELECT {','.join(select_cols)} "
-            "FROM ntm_screening WHERE ticker = ? ORDER BY date",
-            (ticker_upper,),
-        )
-        rows = rows_to_dicts(cur.fetchall())
+        available = _TICKER_HISTORY_COLUMNS + _schema.present(conn, "ntm_screening", _TICKER_HISTORY_OPTIONAL)
+        wanted = fields if fields is not None else available + _SEGMENT_FIELDS
+        unknown = [f for f in wanted if f not in available and f not in _SEGMENT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # Downsampling needs a numeric series: every history column except date
+        if metric == "date" or metric not in available:
+            raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+
+        # Output keys in the canonical order; inputs may add segment/metric columns
+        out_cols = [c for c in available + _SEGMENT_FIELDS if c == "date" or c in wanted]
+        with_segments = any(c in _SEGMENT_FIELDS for c in out_cols)
+        needed = set(out_cols) | ({metric} if points is not None else set())
+        if with_segments:
+            needed.update(_SEGMENT_INPUTS)
+        select_cols = [c for c in available if c in needed]
+
+        sql, params = _ticker_history_sql(conn, ticker, select_cols, start, end)
+        rows = rows_to_dicts(conn.execute(sql, params).fetchall())
+
+    if points is not None and len(rows) > points:
+        x = np.array([r["date"] for r in rows], dtype="datetime64[D]").astype(np.float64)
+        keep = _lttb_indices(x, _column(rows, metric), points)
+        rows = [rows[i] for i in keep.tolist()]
+
+    # Segments for every row in one columnar pass; rev_growth as percent
+    enriched = _enrich_columns(rows)
+    result = []
+    for i, row in enumerate(rows):
+        if with_segments:
+            for seg in _SEGMENT_FIELDS:
+                row[seg] = enriched[seg][i]
+        if "rev_growth" in row:
+            row["rev_growth"] = enriched["rev_growth"][i]
+        result.append({c: row[c] for c in out_cols})
+    return result
 
-    # Compute segments for each row
-    for row in rows:
-        ntm_current = row.get("ntm_current") or 0
-        ntm_7d = row.get("ntm_7d") or 0
-        ntm_30d = row.get("ntm_30d") or 0
-        ntm_60d = row.get("ntm_60d") or 0
-        ntm_90d = row.get("ntm_90d") or 0
-        s1, s2, s3, s4 = calc_segments(ntm_current, ntm_7d, ntm_30d, ntm_60d, ntm_90d)
-        row["seg1"] = round(s1, 2)
-        row["seg2"] = round(s2, 2)
-        row["seg3"] = round(s3, 2)
-        row["seg4"] = round(s4, 2)
-        # Convert rev_growth from ratio to percent
-        rg = row.get("rev_growth")
-        if rg is not None:
-            row["rev_growth"] = round(rg * 100, 1)
+
+@app.get("/api/ticker/{ticker}")
+@_db_executor.endpoint
+def get_ticker_history(
+    ticker: str,
+    start: Optional[str] = Query(None, alias="from", description="first date (YYYY-MM-DD), inclusive"),
+    end: Optional[str] = Query(None, alias="to", description="last date (YYYY-MM-DD), inclusive"),
+    fields: Optional[str] = Query(None, description="comma-separated columns; date is always included"),
+    points: Optional[int] = Query(None, ge=3, description="downsample to this many rows (LTTB)"),
+    metric: str = Query("price", description="numeric column whose shape downsampling preserves"),
+):
+    """Historical screening data for a single ticker, enriched with ticker info.
+
+    Without parameters every row is returned. Slices are cached per
+    (ticker, range, fields, resolution) until the DB changes.
+    """
+    ticker_upper = ticker.upper()
+    info = _ticker_info.get(ticker_upper)
+    field_list = None
+    if fields:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+
+    key = f"ticker:{_db_file_version()}:{ticker_upper}:{start}:{end}:{','.join(field_list or ['*'])}:{points}:{metric}"
+    rows = cached(
+        key,
+        RESULT_CACHE_TTL,
+        partial(_ticker_history_rows, ticker_upper, start, end, field_list, points, metric),
+    )
 
     return {
         "ticker": ticker_upper,
-        "short_name": info["short_name"],
-        "industry_en": info["industry_en"],
-        "industry_kr": info["industry_kr"],
+        "short_name": info.short_name,
+        "industry_en": info.industry_en,
+        "industry_kr": info.industry_kr,
         "history": rows,
     }
 
 
+@app.get("/api/ticker/{ticker}/stream")
+@_db_executor.endpoint
+def stream_ticker_history(
+    ticker: str,
+    start: Optional[str] = Query(None, alias="from", description="first date (YYYY-MM-DD), inclusive"),
+    end: Optional[str] = Query(None, alias="to", description="last date (YYYY-MM-DD), inclusive"),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|json)$"),
+):
+    """/api/ticker/{ticker} history streamed batch by batch (segments enriched per batch).
+
+    format=ndjson: one history row per line, oldest first.
+    format=json: the same document as /api/ticker/{ticker}, sent in chunks.
+    """
+    ticker_upper = ticker.upper()
+    info = _ticker_info.get(ticker_upper)
+    with get_db() as conn:
+        select_cols = _TICKER_HISTORY_COLUMNS + _schema.present(conn, "ntm_screening", _TICKER_HISTORY_OPTIONAL)
+        sql, params = _ticker_history_sql(conn, ticker_upper, select_cols, start, end)
+
+    def items():
+        for batch in _stream_rows(sql, params):
+            enriched = _enrich_columns(batch)
+            for i, row in enumerate(batch):
+                for seg in _SEGMENT_FIELDS:
+                    row[seg] = enriched[seg][i]
+                if "rev_growth" in row:
+                    row["rev_growth"] = enriched["rev_growth"][i]
+                yield row, _dump_payload(row)
+
+    head = {
+        "ticker": ticker_upper,
+        "short_name": info.short_name,
+        "industry_en": info.industry_en,
+        "industry_kr": info.industry_kr,
+    }
+    open_ = _dump_payload(head)[:-1] + ',"history":['
+    return StreamingResponse(
+        _db_executor.iterate(_ndjson_or_chunked(fmt, items(), open_, "]}")), media_type=_STREAM_MEDIA_TYPES[fmt],
+    )
+
+
 # ---------------------------------------------------------------------------
 # Stats endpoint (enhanced)
 # ---------------------------------------------------------------------------
 
 
 @app.get("/api/stats/{date}")
-def get_stats(date: str):
-    """Screening statistics for a date, including industry distribution."""
-    with get_db() as conn:
+@_db_executor.endpoint
+def get_stats(date: str, request: Request):
+    """Screening statistics for a date, including industry distribution.
+
+    Past dates are served from the precomputed payload store.
+    """
+    return _serve_date_payload("stats", date, request)
+
+
+def _build_stats_payload(date: str, conn=None, ctx: Optional[dict] = None):
+    """Build the /api/stats/{date} payload (uncached)."""
+    with _use_db(conn) as conn:
         # Total screened
         total_screened = conn.execute(
             "SELECT COUNT(*) as cnt FROM ntm_screening WHERE date = ?", (date,)
@@ -1214,10 +3927,6 @@ def get_stats(date: str):
             (date,),
         ).fetchone()["cnt"]
 
-        # 3-day status counts
-        last3 = _get_last_n_part2_dates(conn, 3)
-        td_map = _build_ticker_dates_map(conn, last3)
-
         # Get tickers in today's Top 30
         cur = conn.execute(
             "SELECT ticker FROM ntm_screening WHERE date = ? AND part2_rank IS NOT NULL",
@@ -1225,6 +3934,10 @@ def get_stats(date: str):
         )
         today_tickers = [r["ticker"] for r in cur.fetchall()]
 
+        # 3-day status counts
+        top30 = _top30_context(conn, date, ctx, today_tickers)
+        last3, td_map = top30["last3"], top30["td_map"]
+
         verified_count = 0
         new_count = 0
         for t in today_tickers:
@@ -1234,11 +3947,11 @@ def get_stats(date: str):
             elif st == "\U0001f195":
                 new_count += 1
 
-        # Industry distribution from TICKER_CACHE
+        # Industry distribution from the ticker info index
         industry_distribution: dict[str, int] = {}
+        infos = _ticker_info.get_many(today_tickers)
         for t in today_tickers:
-            info = _get_ticker_info(t)
-            ind_kr = info["industry_kr"]
+            ind_kr = infos[t].industry_kr
             industry_distribution[ind_kr] = industry_distribution.get(ind_kr, 0) + 1
 
         # Sort by count descending
@@ -1263,119 +3976,203 @@ def get_stats(date: str):
 
 
 @app.get("/api/exited/{date}")
-def get_exited(date: str):
+@_db_executor.endpoint
+def get_exited(date: str, request: Request):
     """
     Death list: stocks that were in yesterday's Top 30 but dropped out today.
     Enhanced with short_name, industry_kr, and current_rank (if still in DB).
+
+    Past dates are served from the precomputed payload store.
     """
-    with get_db() as conn:
-        # Find the date immediately before 'date' that has part2_rank data
-        cur = conn.execute(
-            "SELECT DISTINCT date FROM ntm_screening "
-            "WHERE part2_rank IS NOT NULL AND date < ? "
-            "ORDER BY date DESC LIMIT 1",
-            (date,),
-        )
-        prev_row = cur.fetchone()
-        if prev_row is None:
-            return []
-        prev_date = prev_row["date"]
+    return _serve_date_payload("exited", date, request)
 
-        # Yesterday's Top 30
-        cur = conn.execute(
-            "SELECT ticker, part2_rank FROM ntm_screening "
-            "WHERE date = ? AND part2_rank IS NOT NULL",
-            (prev_date,),
-        )
-        yesterday = {r["ticker"]: r["part2_rank"] for r in cur.fetchall()}
 
-        # Today's Top 30
-        cur = conn.execute(
-            "SELECT ticker FROM ntm_screening "
-            "WHERE date = ? AND part2_rank IS NOT NULL",
-            (date,),
-        )
-        today_set = {r["ticker"] for r in cur.fetchall()}
+def _build_exited_payload(date: str, conn=None, ctx: Optional[dict] = None):
+    """Build the /api/exited/{date} payload (uncached)."""
+    # The date immediately before 'date' that has part2_rank data
+    prev_date = _date_index.prev(date)
+    if prev_date is None:
+        return []
+    last3 = ctx["last3"] if ctx and "last3" in ctx else None
+    return _build_exited_between(prev_date, date, conn, last3)
 
-        # Today's composite_rank for all tickers (to show current rank for exited stocks)
-        cols = _get_columns(conn, "ntm_screening")
-        has_composite = "composite_rank" in cols
-        current_ranks = {}
-        if has_composite:
-            cur = conn.execute(
-                "SELECT ticker, composite_rank FROM ntm_screening "
-                "WHERE date = ? AND composite_rank IS NOT NULL",
-                (date,),
-            )
-            current_ranks = {r["ticker"]: r["composite_rank"] for r in cur.fetchall()}
 
-        # Rank history context
-        last3 = _get_last_n_part2_dates(conn, 3)
+def _build_exited_between(from_date: str, to_date: str, conn=None, last3: Optional[list] = None):
+    """Stocks in the Top 30 on *from_date* but not on *to_date*, with to_date details.
+
+    One statement: from_date's Top 30 LEFT JOIN to_date's rows on ticker,
+    kept where to_date has no part2_rank (the anti-join). to_date's
+    composite_rank and detail columns come from the same join, so any
+    date pair costs the same as consecutive days.
+    """
+    with _use_db(conn) as conn:
+        sql = _schema.sql(conn, "exited_between", lambda: (
+            "SELECT p.ticker, p.part2_rank AS prev_rank, "
+            + ("t.composite_rank AS current_rank, "
+               if "composite_rank" in _schema.columns(conn, "ntm_screening") else "NULL AS current_rank, ")
+            + "t.adj_score, t.adj_gap, t.price, t.ntm_current, t.ntm_7d, t.ntm_30d, t.ntm_60d, t.ntm_90d, "
+            "t.rev_up30, t.rev_down30, t.rev_growth "
+            "FROM ntm_screening p "
+            "LEFT JOIN ntm_screening t ON t.ticker = p.ticker AND t.date = ? "
+            "WHERE p.date = ? AND p.part2_rank IS NOT NULL AND t.part2_rank IS NULL "
+            "ORDER BY p.part2_rank"
+        ))
+        cur = conn.execute(sql, (to_date, from_date))
+        details = rows_to_dicts(cur.fetchall())
+
+        # Rank history context — one batched query for all exited tickers
+        if last3 is None:
+            last3 = _get_last_n_part2_dates(3)
+        rank_ctx = _fetch_rank_context(conn, [d["ticker"] for d in details], last3)
+
+    # Trend / EPS change / revenue growth for all exited stocks in one pass
+    enriched = _enrich_columns(details)
+    infos = _ticker_info.get_many({d["ticker"] for d in details})
+
+    exited = []
+    for i, detail in enumerate(details):
+        ticker = detail["ticker"]
+        info = infos[ticker]
+        ticker_ctx = rank_ctx.get(ticker, {})
+
+        # Exit reason
+        adj_gap = detail.get("adj_gap") or 0
+        exit_reason = "괴리+" if adj_gap > 0 else "펀더멘탈"
+
+        exited.append({
+            "ticker": ticker,
+            "short_name": info.short_name,
+            "industry_kr": info.industry_kr,
+            "prev_date": from_date,
+            "prev_rank": detail["prev_rank"],
+            "current_rank": detail["current_rank"],
+            "rank_history": _build_rank_history(last3, ticker_ctx),
+            "rank_change_tag": _compute_rank_change_tags(last3, ticker_ctx),
+            "trend": enriched["trend"][i],
+            "eps_change_90d": enriched["eps_change_90d"][i],
+            "rev_growth": enriched["rev_growth"][i],
+            "adj_gap": round(adj_gap, 1),
+            "rev_up30": detail.get("rev_up30") or 0,
+            "rev_down30": detail.get("rev_down30") or 0,
+            "exit_reason": exit_reason,
+        })
+
+    return exited
 
-        # Exited — enriched with trend, EPS, revenue data
-        exited = []
-        for ticker, rank in sorted(yesterday.items(), key=lambda x: x[1]):
-            if ticker not in today_set:
-                info = _get_ticker_info(ticker)
-                rank_hist = _build_rank_history(ticker, last3, conn)
-                rank_tag = _compute_rank_change_tags(ticker, last3, conn)
 
-                # Fetch today's screening data for detailed info
-                cur = conn.execute(
-                    "SELECT adj_score, adj_gap, price, ntm_current, ntm_7d, ntm_30d, ntm_60d, ntm_90d, "
-                    "rev_up30, rev_down30, rev_growth "
-                    "FROM ntm_screening WHERE date = ? AND ticker = ?",
-                    (date, ticker),
-                )
-                detail = dict(cur.fetchone()) if cur.fetchone() is not None else {}
-                # Re-fetch since fetchone consumed it
-                cur = conn.execute(
-                    "SELECT adj_score, adj_gap, price, ntm_current, ntm_7d, ntm_30d, ntm_60d, ntm_90d, "
-                    "rev_up30, rev_down30, rev_growth "
-                    "FROM ntm_screening WHERE date = ? AND ticker = ?",
-                    (date, ticker),
-                )
-                row = cur.fetchone()
-                detail = dict(row) if row else {}
-
-                # Compute trend for exited stock
-                ntm_c = detail.get("ntm_current") or 0
-                ntm_7 = detail.get("ntm_7d") or 0
-                ntm_30 = detail.get("ntm_30d") or 0
-                ntm_60 = detail.get("ntm_60d") or 0
-                ntm_90 = detail.get("ntm_90d") or 0
-                s1, s2, s3, s4 = calc_segments(ntm_c, ntm_7, ntm_30, ntm_60, ntm_90)
-                trend = trend_icon(s4) + trend_icon(s3) + trend_icon(s2) + trend_icon(s1)
-
-                # EPS change 90d
-                eps_chg_90d = round(((ntm_c - ntm_90) / abs(ntm_90)) * 100, 2) if ntm_90 != 0 else None
-
-                # Exit reason
-                adj_gap = detail.get("adj_gap") or 0
-                exit_reason = "괴리+" if adj_gap > 0 else "펀더멘탈"
-
-                rg = detail.get("rev_growth")
-                rev_growth_pct = round(rg * 100, 1) if rg is not None else None
-
-                exited.append({
-                    "ticker": ticker,
-                    "short_name": info["short_name"],
-                    "industry_kr": info["industry_kr"],
-                    "prev_date": prev_date,
-                    "prev_rank": rank,
-                    "current_rank": current_ranks.get(ticker),
-                    "rank_history": rank_hist,
-                    "rank_change_tag": rank_tag,
-                    "trend": trend,
-                    "eps_change_90d": eps_chg_90d,
-                    "rev_growth": rev_growth_pct,
-                    "adj_gap": round(adj_gap, 1),
-                    "rev_up30": detail.get("rev_up30") or 0,
-                    "rev_down30": detail.get("rev_down30") or 0,
-                    "exit_reason": exit_reason,
-                })
+@app.get("/api/exited")
+@_db_executor.endpoint
+def get_exited_between(
+    start: str = Query(..., alias="from", description="earlier date (YYYY-MM-DD)"),
+    end: str = Query(..., alias="to", description="later date (YYYY-MM-DD)"),
+):
+    """Stocks that left the Top 30 between any two dates (e.g. week- or month-over-week).
+
+    Same rows as /api/exited/{date}, with prev_date = from. Cached until the DB changes.
+    """
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be earlier than 'to'")
+    return cached(
+        f"exited:{_db_file_version()}:{_ticker_info.version()}:{start}:{end}",
+        RESULT_CACHE_TTL,
+        partial(_build_exited_between, start, end),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Top-30 turnover / churn analytics
+# ---------------------------------------------------------------------------
+
+# Part2 dates are numbered 1..N so "consecutive" means consecutive trading
+# days. Per ticker, LAG/LEAD over that number find entries (no membership
+# the day before) and exits (none the day after, counted on the next day);
+# di - ROW_NUMBER() labels each unbroken run (gaps-and-islands) for streaks.
+_TURNOVER_SQL = """
+WITH d AS (
+    SELECT date, ROW_NUMBER() OVER (ORDER BY date) AS di
+    FROM (SELECT DISTINCT date FROM ntm_screening WHERE part2_rank IS NOT NULL)
+),
+m AS (
+    SELECT s.ticker, d.di, d.date
+    FROM ntm_screening s JOIN d ON d.date = s.date
+    WHERE s.part2_rank IS NOT NULL
+),
+w AS (
+    SELECT ticker, di, date,
+           LAG(di) OVER t AS prev_di,
+           LEAD(di) OVER t AS next_di,
+           di - ROW_NUMBER() OVER t AS island
+    FROM m
+    WINDOW t AS (PARTITION BY ticker ORDER BY di)
+),
+s AS (
+    SELECT *, di - MIN(di) OVER (PARTITION BY ticker, island) + 1 AS streak FROM w
+),
+daily AS (
+    SELECT di, date, COUNT(*) AS members,
+           SUM(CASE WHEN prev_di IS NULL OR prev_di <> di - 1 THEN 1 ELSE 0 END) AS entries,
+           AVG(streak) AS avg_streak
+    FROM s GROUP BY di
+),
+exits AS (
+    SELECT di + 1 AS di, COUNT(*) AS exits
+    FROM s WHERE next_di IS NULL OR next_di <> di + 1
+    GROUP BY di
+)
+SELECT daily.di, daily.date, daily.members, daily.entries,
+       COALESCE(exits.exits, 0) AS exits, daily.avg_streak
+FROM daily LEFT JOIN exits ON exits.di = daily.di
+ORDER BY daily.di
+"""
+
+
+def _compute_turnover_series() -> list[dict]:
+    """Daily Top-30 entries, exits, turnover and average holding streak for every part2 date."""
+    with get_db() as conn:
+        rows = conn.execute(_TURNOVER_SQL).fetchall()
+
+    series = []
+    prev_members = None
+    for r in rows:
+        first = r["di"] == 1  # no previous day to compare with
+        series.append({
+            "date": r["date"],
+            "members": r["members"],
+            "entries": None if first else r["entries"],
+            "exits": None if first else r["exits"],
+            # Exits as a share of the previous day's Top 30
+            "turnover_pct": None if first or not prev_members else round(r["exits"] / prev_members * 100, 1),
+            # Average consecutive days in the Top 30 of today's members
+            "avg_holding_streak": round(r["avg_streak"], 2),
+        })
+        prev_members = r["members"]
+    return series
+
 
-        return exited
+@app.get("/api/analytics/turnover")
+@_db_executor.endpoint
+def get_turnover(
+    start: Optional[str] = Query(None, alias="from", description="first date (YYYY-MM-DD), inclusive"),
+    end: Optional[str] = Query(None, alias="to", description="last date (YYYY-MM-DD), inclusive"),
+):
+    """Top-30 churn time series: entries, exits, turnover rate and average holding streak.
+
+    The full history is one window-function query, cached until the DB
+    changes; from/to only slice the cached series.
+    """
+    series = cached(f"turnover:{_db_file_version()}", RESULT_CACHE_TTL, _compute_turnover_series)
+    if start or end:
+        series = [p for p in series if (not start or p["date"] >= start) and (not end or p["date"] <= end)]
+
+    turnovers = [p["turnover_pct"] for p in series if p["turnover_pct"] is not None]
+    return {
+        "days": len(series),
+        "avg_turnover_pct": round(sum(turnovers) / len(turnovers), 1) if turnovers else None,
+        "avg_holding_streak": (
+            round(sum(p["avg_holding_streak"] for p in series) / len(series), 2) if series else None
+        ),
+        "series": series,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -1384,9 +4181,18 @@ def get_exited(date: str):
 
 
 @app.get("/api/ai-review/{date}")
-def get_ai_review(date: str):
-    """AI risk review for a date: computed risk flags + stored AI analysis text."""
-    with get_db() as conn:
+@_db_executor.endpoint
+def get_ai_review(date: str, request: Request):
+    """AI risk review for a date: computed risk flags + stored AI analysis text.
+
+    Past dates are served from the precomputed payload store.
+    """
+    return _serve_date_payload("ai_review", date, request)
+
+
+def _build_ai_review_payload(date: str, conn=None, ctx: Optional[dict] = None):
+    """Build the /api/ai-review/{date} payload (uncached)."""
+    with _use_db(conn) as conn:
         # 1) Computed risk flags from screening data (always available)
         cur = conn.execute(
             "SELECT ticker, part2_rank, adj_score, adj_gap, price, ntm_current, "
@@ -1398,14 +4204,14 @@ def get_ai_review(date: str):
         rows = rows_to_dicts(cur.fetchall())
 
         risk_stocks = []
-        for row in rows:
-            flags = _compute_risk_flags(row)
+        ticker_info = _ticker_info.resolver()
+        for row, flags in zip(rows, _enrich_columns(rows)["risk_flags"]):
             if flags:
-                info = _get_ticker_info(row["ticker"])
+                info = ticker_info(row["ticker"])
                 risk_stocks.append({
                     "ticker": row["ticker"],
-                    "short_name": info["short_name"],
-                    "industry_kr": info["industry_kr"],
+                    "short_name": info.short_name,
+                    "industry_kr": info.industry_kr,
                     "part2_rank": row["part2_rank"],
                     "flags": flags,
                 })
@@ -1414,12 +4220,7 @@ def get_ai_review(date: str):
         ai_text = None
         portfolio_text = None
 
-        # Check if ai_analysis table exists
-        table_check = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='ai_analysis'"
-        ).fetchone()
-
-        if table_check:
+        if _schema.has_table(conn, "ai_analysis"):
             cur = conn.execute(
                 "SELECT analysis_type, content FROM ai_analysis "
                 "WHERE date = ? AND ticker = '__ALL__'",
@@ -1439,10 +4240,311 @@ def get_ai_review(date: str):
     }
 
 
+# ---------------------------------------------------------------------------
+# Payload store backfill (CLI: python main.py backfill)
+# ---------------------------------------------------------------------------
+
+_PAYLOAD_BUILDERS = {
+    "screening": _build_screening_payload,
+    "stats": _build_stats_payload,
+    "exited": _build_exited_payload,
+    "ai_review": _build_ai_review_payload,
+}
+
+
+def _backfill_worker_init():
+    """Give each worker process its own connection pool (never share across fork)."""
+    global _db_pool
+    _db_pool = _ConnectionPool(DB_PATH, 1, DB_POOL_TIMEOUT)
+
+
+def _backfill_date(date: str, kinds: list[str]) -> tuple[list, list]:
+    """Build every payload kind for one date -> ([(kind, date, body)], [(kind, date, error)])."""
+    items, failures = [], []
+    for kind in kinds:
+        try:
+            items.append((kind, date, _dump_payload(_PAYLOAD_BUILDERS[kind](date))))
+        except Exception as e:
+            failures.append((kind, date, f"{type(e).__name__}: {e}"))
+    return items, failures
+
+
+def backfill_payload_store(workers: Optional[int] = None, kinds: Optional[list[str]] = None) -> dict:
+    """Rebuild stored payloads for every past part2 date across a process pool."""
+    kinds = kinds or list(_PAYLOAD_BUILDERS)
+    dates = _date_index.all_desc()
+    if not dates:
+        return {"as_of": None, "dates": 0, "written": 0, "failed": [], "pruned": 0}
+    latest, past = dates[0], dates[1:]
+    as_of = _payload_as_of(latest)
+
+    # Don't carry open read connections into forked workers
+    _db_pool.clear()
+
+    started = time.time()
+    written = 0
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_backfill_worker_init) as ex:
+        for items, failures in ex.map(partial(_backfill_date, kinds=kinds), past, chunksize=8):
+            _payload_store.put_many(items, as_of)
+            written += len(items)
+            failed.extend(failures)
+    pruned = _payload_store.prune(as_of)
+
+    return {
+        "as_of": latest,
+        "dates": len(past),
+        "kinds": kinds,
+        "written": written,
+        "failed": failed,
+        "pruned": pruned,
+        "elapsed_sec": round(time.time() - started, 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Columnar export (Parquet / Arrow IPC; CLI: python main.py export)
+# ---------------------------------------------------------------------------
+
+_EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+
+_EXPORT_FLOAT_TYPES = ("REAL", "FLOA", "DOUB", "NUMERIC")
+
+
+def _export_arrow_type(declared: str):
+    """Arrow type for a SQLite declared column type.
+
+    INT -> int64 and REAL/FLOAT/DOUBLE/NUMERIC -> float64. Everything else
+    (TEXT, DATE/DATETIME as stored strings, untyped or unknown) is exported
+    as string, with non-text values stringified by _export_batch.
+    """
+    declared = declared.upper()
+    if "INT" in declared:
+        return pa.int64()
+    if any(t in declared for t in _EXPORT_FLOAT_TYPES):
+        return pa.float64()
+    return pa.string()
+
+
+def _export_schema(conn):
+    """Every ntm_screening column, then ticker info and the derived screening metrics."""
+    fields = [(name, _export_arrow_type(declared)) for name, declared in _schema.column_types(conn, "ntm_screening")]
+    fields += [(c, pa.string()) for c in ("short_name", "industry_en", "industry_kr")]
+    fields += [(c, pa.float64()) for c in _SEGMENT_FIELDS]
+    fields += [
+        ("trend", pa.string()),
+        ("eps_change_90d", pa.float64()),
+        ("fwd_pe", pa.float64()),
+        ("risk_flags", pa.list_(pa.string())),
+    ]
+    return pa.schema(fields)
+
+
+def _export_number(value, cast):
+    """*value* as int/float for a numeric export column; None if it isn't a number.
+
+    SQLite lets any column hold any type, so an INT/REAL column may carry
+    stray text. Nulling it here keeps one bad cell from failing a batch
+    after the response headers have gone out.
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if cast is float:
+        return number
+    if not number.is_integer() or not -(2 ** 63) <= number < 2 ** 63:
+        return None
+    return int(number)
+
+
+def _export_batch(rows: list[dict], schema):
+    """One RecordBatch: raw columns, ticker info and _enrich_columns() output.
+
+    rev_growth is exported as a percent, like /api/screening; risk_flags
+    holds the flag types. Non-numeric values in numeric columns are
+    exported as null (see _export_number).
+    """
+    for field in schema:
+        if field.name not in rows[0]:
+            continue
+        cast = int if field.type == pa.int64() else float if field.type == pa.float64() else None
+        if cast is None:
+            continue
+        for r in rows:
+            v = r[field.name]
+            if v is not None and type(v) is not cast:
+                r[field.name] = _export_number(v, cast)
+    enriched = _enrich_columns(rows)
+    infos = _ticker_info.get_many({r["ticker"] for r in rows})
+    columns = {}
+    for field in schema:
+        name = field.name
+        if name in ("short_name", "industry_en", "industry_kr"):
+            values = [getattr(infos[r["ticker"]], name) for r in rows]
+        elif name == "risk_flags":
+            values = [[f["type"] for f in flags] for flags in enriched["risk_flags"]]
+        elif name in enriched:
+            values = enriched[name]
+        elif field.type == pa.string():
+            # SQLite lets any column hold any type; keep strings as-is, stringify the rest
+            values = [v if v is None or isinstance(v, str) else str(v) for v in (r[name] for r in rows)]
+        else:
+            values = [r[name] for r in rows]
+        columns[name] = pa.array(values, type=field.type)
+    return pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _write_export(sink, fmt: str, start: Optional[str], end: Optional[str], batch_rows: int = EXPORT_BATCH_ROWS):
+    """Stream ntm_screening rows in [start, end] to *sink* as Parquet or Arrow IPC.
+
+    A generator: yields the running row count after each batch is
+    written, so callers can drain the sink between batches. Memory is
+    bounded by *batch_rows* whatever the range size.
+    """
+    # Unpooled, like _stream_rows: an export lasts as long as the client reads
+    conn = _db_pool.open_unpooled()
+    try:
+        schema = _export_schema(conn)
+        if fmt == "parquet":
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+
+        where, params = _date_range_where(start, end)
+        cur = conn.execute(
+            "SELECT * FROM ntm_screening"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY date, ticker",
+            params,
+        )
+        total = 0
+        try:
+            while True:
+                rows = cur.fetchmany(batch_rows)
+                if not rows:
+                    break
+                writer.write_batch(_export_batch(rows_to_dicts(rows), schema))
+                total += len(rows)
+                yield total
+        finally:
+            writer.close()
+    finally:
+        conn.close()
+    yield total
+
+
+class _ChunkSink:
+    """Write-only file object whose bytes are drained between export batches."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _export_chunks(fmt: str, start: Optional[str], end: Optional[str]):
+    sink = _ChunkSink()
+    for _ in _write_export(sink, fmt, start, end):
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+
+
+@app.get("/api/export/screening")
+@_db_executor.endpoint
+def export_screening(
+    start: Optional[str] = Query(None, alias="from", description="first date (YYYY-MM-DD), inclusive"),
+    end: Optional[str] = Query(None, alias="to", description="last date (YYYY-MM-DD), inclusive"),
+    fmt: str = Query("parquet", alias="format", pattern="^(parquet|arrow)$"),
+):
+    """ntm_screening for a date range with ticker info and derived metrics, as Parquet or Arrow IPC.
+
+    Streamed batch by batch (EPS_EXPORT_BATCH_ROWS rows each).
+    """
+    if pa is None:
+        raise HTTPException(status_code=501, detail="pyarrow is not installed")
+    media_type, ext = _EXPORT_FORMATS[fmt]
+    filename = f"ntm_screening_{start or 'first'}_{end or 'last'}.{ext}"
+    return StreamingResponse(
+        _db_executor.iterate(_export_chunks(fmt, start, end)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def export_screening_file(path: str, fmt: str, start: Optional[str], end: Optional[str]) -> dict:
+    """CLI export to a local file."""
+    if pa is None:
+        raise SystemExit("pyarrow is not installed")
+    started = time.time()
+    rows = 0
+    with open(path, "wb") as f:
+        for rows in _write_export(f, fmt, start, end):
+            pass
+    return {
+        "path": path,
+        "format": fmt,
+        "rows": rows,
+        "bytes": os.path.getsize(path),
+        "elapsed_sec": round(time.time() - started, 2),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="EPS Momentum Dashboard API")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("serve", help="run the API server (default)")
+    bf = sub.add_parser("backfill", help="rebuild the payload store for all past dates")
+    bf.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    bf.add_argument("--kinds", nargs="+", choices=sorted(_PAYLOAD_BUILDERS), default=None)
+    ex = sub.add_parser("export", help="export ntm_screening with derived columns to Parquet/Arrow")
+    ex.add_argument("--from", dest="start", default=None, help="first date (YYYY-MM-DD), inclusive")
+    ex.add_argument("--to", dest="end", default=None, help="last date (YYYY-MM-DD), inclusive")
+    ex.add_argument("--format", dest="fmt", choices=sorted(_EXPORT_FORMATS), default="parquet")
+    ex.add_argument("--out", required=True, help="output file path")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        print(json.dumps(backfill_payload_store(args.workers, args.kinds), ensure_ascii=False, indent=2))
+    elif args.command == "export":
+        print(json.dumps(export_screening_file(args.out, args.fmt, args.start, args.end), indent=2))
+    else:
+        import uvicorn
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
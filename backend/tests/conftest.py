@@ -0,0 +1,95 @@
+"""
+Shared fixtures: a small synthetic EPS database and side stores in a temp dir.
+
+The EPS_* environment is set here, before main is imported, because main
+reads its configuration at import time.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TMP_DIR = tempfile.mkdtemp(prefix="eps-tests-")
+DB_PATH = os.path.join(TMP_DIR, "eps.db")
+
+TEST_ENV = {
+    "EPS_DB_PATH": DB_PATH,
+    "EPS_PAYLOAD_STORE_PATH": os.path.join(TMP_DIR, "payload_store.db"),
+    "EPS_MARKET_STORE_PATH": os.path.join(TMP_DIR, "market_store.db"),
+    "EPS_MARKET_REFRESHER": "0",
+}
+os.environ.update(TEST_ENV)
+sys.path.insert(0, BACKEND_DIR)
+
+TICKERS = ["NVDA", "AAPL", "MSFT"] + [f"T{i:02d}" for i in range(37)]
+
+
+def _trading_days(n: int) -> list[str]:
+    d, days = date(2025, 1, 2), []
+    while len(days) < n:
+        if d.weekday() < 5:
+            days.append(d.isoformat())
+        d += timedelta(days=1)
+    return days
+
+
+def build_db(path: str, days: int = 6, seed: int = 7):
+    """ntm_screening + portfolio_log + ai_analysis with a Top-30 on every date."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE ntm_screening (
+            date TEXT, ticker TEXT, part2_rank INTEGER, score REAL, adj_score REAL, adj_gap REAL,
+            price REAL, ma60 REAL, ntm_current REAL, ntm_7d REAL, ntm_30d REAL, ntm_60d REAL,
+            ntm_90d REAL, rev_up30 INTEGER, rev_down30 INTEGER, num_analysts INTEGER,
+            is_turnaround INTEGER, composite_rank INTEGER, rev_growth REAL
+        );
+        CREATE TABLE portfolio_log (
+            date TEXT, ticker TEXT, action TEXT, price REAL, weight REAL, entry_date TEXT,
+            entry_price REAL, exit_price REAL, return_pct REAL
+        );
+        CREATE TABLE ai_analysis (date TEXT, ticker TEXT, analysis_type TEXT, content TEXT);
+    """)
+    for dt in _trading_days(days):
+        scores = {t: rng.gauss(10, 3) for t in TICKERS}
+        order = sorted(TICKERS, key=lambda t: -scores[t])
+        for rank, t in enumerate(order, 1):
+            ntm = rng.uniform(1, 10)
+            conn.execute(
+                "INSERT INTO ntm_screening VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+                (dt, t, rank if rank <= 30 else None, scores[t], scores[t] + 1, rng.gauss(0, 5),
+                 rng.uniform(5, 500), rng.uniform(5, 500), ntm, ntm * 0.99, ntm * 0.97, ntm * 0.95,
+                 ntm * 0.93, rng.randint(0, 10), rng.randint(0, 3), rng.randint(3, 30), 0, rank,
+                 rng.uniform(-0.2, 0.8)),
+            )
+        for t in order[:5]:
+            conn.execute(
+                "INSERT INTO portfolio_log VALUES (?,?,?,?,?,?,?,?,?)",
+                (dt, t, "hold", rng.uniform(5, 500), 20.0, dt, rng.uniform(5, 500), None, None),
+            )
+        conn.execute("INSERT INTO ai_analysis VALUES (?,?,?,?)", (dt, "__ALL__", "ai_review", f"review {dt}"))
+    conn.commit()
+    conn.close()
+
+
+build_db(DB_PATH)
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def client(main_module):
+    from fastapi.testclient import TestClient
+
+    with TestClient(main_module.app) as c:
+        yield c
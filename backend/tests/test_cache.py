@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+def test_single_flight_and_no_lock_leak(main_module):
+    cache = main_module._TTLCache(max_entries=2)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", 60, slow)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["v"] * 8
+    assert len(calls) == 1
+
+    for i in range(50):  # distinct keys, most evicted by the LRU bound
+        cache.get_or_compute(f"key{i}", 60, lambda: i)
+    snap = cache.snapshot()
+    assert snap["inflight"] == 0
+    assert snap["entries"] == 2
+
+
+def test_expired_key_releases_its_lock(main_module):
+    cache = main_module._TTLCache(max_entries=8)
+    cache.get_or_compute("k", 0, lambda: 1)
+    assert cache.get_or_compute("k", 60, lambda: 2) == 2
+    assert cache.snapshot()["inflight"] == 0
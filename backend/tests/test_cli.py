@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR, TEST_ENV
+
+
+def _run_cli(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "main.py", *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **TEST_ENV},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+
+def test_backfill_entry_point():
+    proc = _run_cli("backfill", "--workers", "1")
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+    assert result["as_of"] is not None
+    assert result["dates"] > 0
+    assert result["failed"] == []
+    assert result["written"] == result["dates"] * len(result["kinds"])
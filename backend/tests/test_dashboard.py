@@ -0,0 +1,29 @@
+import threading
+import time
+
+
+def test_dashboard_does_not_wait_for_first_market_fetch(main_module, client, monkeypatch):
+    refresher = main_module._market_refresher
+    released = threading.Event()
+
+    def slow_fetch():
+        released.wait(5)
+        return {"hy": {"quadrant": "Q1"}, "vix": None, "indices": []}
+
+    monkeypatch.setattr(refresher, "fetcher", slow_fetch)
+    monkeypatch.setattr(refresher, "_snapshot", None)
+    date = client.get("/api/dates").json()[0]
+
+    started = time.monotonic()
+    resp = client.get(f"/api/dashboard/{date}")
+    assert time.monotonic() - started < 2
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["market"] is None
+    assert body["screening"] and body["stats"]
+
+    released.set()  # the background first fetch completes
+    deadline = time.monotonic() + 5
+    while refresher.peek() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get(f"/api/dashboard/{date}").json()["market"]["hy"] == {"quadrant": "Q1"}
@@ -0,0 +1,8 @@
+def test_last_n_and_all_desc_newest_first(main_module, client):
+    index = main_module._date_index
+    dates = client.get("/api/dates").json()
+    assert dates == sorted(dates, reverse=True)
+    assert index.all_desc() is index.all_desc()  # cached per version
+    assert index.last_n(3) == dates[:3]
+    assert index.last_n(len(dates) + 5) == dates
+    assert index.last_n(0) == []
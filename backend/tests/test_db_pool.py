@@ -0,0 +1,37 @@
+import os
+import sqlite3
+
+
+def _make_db(path: str, value: str):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (v TEXT)")
+    conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+
+
+def test_connection_checked_out_across_swap_is_retired(main_module, tmp_path):
+    path = str(tmp_path / "swap.db")
+    _make_db(path, "old")
+    pool = main_module._ConnectionPool(path, 4, 1)
+    in_flight = pool.acquire()
+
+    _make_db(path + ".new", "new")
+    os.replace(path + ".new", path)
+    pool.release(in_flight)
+
+    held = [pool.acquire() for _ in range(4)]
+    assert [c.execute("SELECT v FROM t").fetchone()[0] for c in held] == ["new"] * 4
+    assert pool.snapshot()["retired"] == 1
+
+
+def test_clear_retires_in_use_connections(main_module, tmp_path):
+    path = str(tmp_path / "clear.db")
+    _make_db(path, "x")
+    pool = main_module._ConnectionPool(path, 2, 1)
+    conn = pool.acquire()
+    pool.clear()
+    pool.release(conn)
+    snap = pool.snapshot()
+    assert snap["idle"] == 0
+    assert snap["open"] == 0
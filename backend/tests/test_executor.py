@@ -0,0 +1,69 @@
+import asyncio
+import sqlite3
+import threading
+
+import httpx
+import pytest
+
+
+def test_saturated_db_executor_fails_fast(main_module, client, monkeypatch):
+    executor = main_module._db_executor
+    monkeypatch.setattr(executor, "max_pending", 1)
+    release = threading.Event()
+    busy = executor._submit(release.wait, (5,))
+    rejected = executor.stats["rejected"]
+    try:
+        resp = client.get("/api/dates")
+    finally:
+        release.set()
+        busy.result()
+    assert resp.status_code == 503
+    assert resp.json()["detail"] == "Server busy (db queue full)"
+    assert executor.stats["rejected"] == rejected + 1
+    assert client.get("/api/dates").status_code == 200
+
+
+def test_stuck_market_fetch_does_not_hold_db_routes(main_module, monkeypatch):
+    release = threading.Event()
+
+    class StuckRefresher:
+        def get(self):
+            release.wait(10)
+            return {"stuck": False}
+
+    monkeypatch.setattr(main_module, "_market_refresher", StuckRefresher())
+    workers = main_module._net_executor.workers
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            market = [asyncio.create_task(ac.get("/api/market/live")) for _ in range(workers)]
+            while main_module._net_executor.snapshot()["active"] < workers:
+                await asyncio.sleep(0.01)
+            try:
+                dates = await asyncio.wait_for(ac.get("/api/dates"), timeout=5)
+            finally:
+                release.set()
+            assert dates.status_code == 200
+            assert [r.status_code for r in await asyncio.gather(*market)] == [200] * workers
+
+    asyncio.run(scenario())
+
+
+def test_disconnected_stream_closes_its_connection(main_module, monkeypatch):
+    pool = main_module._db_pool
+    opened = []
+    open_unpooled = pool.open_unpooled
+    monkeypatch.setattr(pool, "open_unpooled", lambda: opened.append(open_unpooled()) or opened[-1])
+
+    async def scenario():
+        resp = await main_module.stream_portfolio_history(fmt="ndjson")
+        assert await resp.body_iterator.__anext__()
+        await resp.body_iterator.aclose()  # client went away mid-stream
+
+    asyncio.run(scenario())
+    assert len(opened) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    assert pool.snapshot()["in_use"] == 0
+    assert main_module._db_executor.snapshot()["streams"] == 0
@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("declared, expected", [
+    ("INTEGER", pa.int64()),
+    ("BIGINT", pa.int64()),
+    ("REAL", pa.float64()),
+    ("DOUBLE PRECISION", pa.float64()),
+    ("FLOAT", pa.float64()),
+    ("NUMERIC", pa.float64()),
+    ("TEXT", pa.string()),
+    ("VARCHAR(10)", pa.string()),
+    ("DATE", pa.string()),
+    ("DATETIME", pa.string()),
+    ("", pa.string()),
+    ("BLOBBY", pa.string()),
+])
+def test_export_arrow_type(main_module, declared, expected):
+    assert main_module._export_arrow_type(declared) == expected
+
+
+def test_export_batch_stringifies_untyped_values(main_module):
+    schema = pa.schema([("ticker", pa.string()), ("note", pa.string()), ("score", pa.float64())])
+    rows = [
+        {"ticker": "NVDA", "note": "2025-01-02", "score": 1.5},
+        {"ticker": "AAPL", "note": 7, "score": None},
+        {"ticker": "MSFT", "note": None, "score": 2.0},
+    ]
+    batch = main_module._export_batch(rows, schema)
+    assert batch.column("note").to_pylist() == ["2025-01-02", "7", None]
+
+
+def test_export_batch_nulls_stray_values_in_numeric_columns(main_module):
+    schema = pa.schema([("ticker", pa.string()), ("part2_rank", pa.int64()), ("score", pa.float64())])
+    rows = [
+        {"ticker": "NVDA", "part2_rank": "n/a", "score": "1.5"},
+        {"ticker": "AAPL", "part2_rank": 2.5, "score": "bad"},
+        {"ticker": "MSFT", "part2_rank": "3", "score": 2},
+    ]
+    batch = main_module._export_batch(rows, schema)
+    assert batch.column("part2_rank").to_pylist() == [None, None, 3]
+    assert batch.column("score").to_pylist() == [1.5, None, 2.0]
+
+
+def test_export_endpoint_parquet(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    resp = client.get("/api/export/screening", params={"format": "parquet"})
+    assert resp.status_code == 200
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.schema.field("date").type == pa.string()
+    assert table.num_rows > 0
@@ -0,0 +1,20 @@
+def test_past_as_of_relative_payloads_revalidate(client):
+    past = client.get("/api/dates").json()[1]
+    for kind in ("screening", "stats", "exited"):
+        resp = client.get(f"/api/{kind}/{past}")
+        assert resp.headers["cache-control"] == "no-cache"
+        etag = resp.headers["etag"]
+        assert client.get(f"/api/{kind}/{past}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_past_portfolio_is_long_lived(client, main_module):
+    past = client.get("/api/dates").json()[1]
+    resp = client.get(f"/api/portfolio/{past}")
+    assert resp.headers["cache-control"] == f"public, max-age={main_module.HTTP_PAST_MAX_AGE}"
+
+
+def test_portfolio_subroutes_are_not_dates(client):
+    for path in ("/api/portfolio/history", "/api/portfolio/performance", "/api/portfolio/analytics"):
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+
+def test_market_refresher_serves_last_good_snapshot(main_module):
+    results = [{"hy": {"value": 1.0}}, RuntimeError("upstream down"), {"hy": None, "vix": None}, {"vix": {"value": 2.0}}]
+    calls = []
+
+    def fetcher():
+        result = results[len(calls)]
+        calls.append(result)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    refresher = main_module._MarketRefresher(fetcher, interval=60)
+    assert refresher.peek() is None
+    first = refresher.get()  # no snapshot yet: the one inline fetch
+    assert first["hy"] == {"value": 1.0}
+    assert first["stale"] is False
+
+    refresher._fetched_at -= 600  # older than 2 x interval
+    stale = refresher.get()
+    assert stale["hy"] == {"value": 1.0}
+    assert stale["stale"] is True
+    assert len(calls) == 1  # served without fetching
+
+    assert refresher.refresh() is False  # raised
+    assert refresher.refresh() is False  # nothing usable
+    kept = refresher.peek()
+    assert kept["hy"] == {"value": 1.0}
+    assert refresher.stats["failures"] == 2
+    assert refresher.stats["last_error"] == "empty snapshot"
+
+    assert refresher.refresh() is True
+    fresh = refresher.peek()
+    assert fresh["vix"] == {"value": 2.0}
+    assert fresh["stale"] is False
+    assert refresher.stats["last_error"] is None
+
+
+def test_empty_sources_are_reported_missing(main_module, monkeypatch):
+    monkeypatch.setattr(main_module, "_fetch_hy_quadrant", lambda: None)
+    monkeypatch.setattr(main_module, "_fetch_vix_data", lambda: {})
+    monkeypatch.setattr(main_module, "_fetch_market_indices", lambda: [{"symbol": "^GSPC"}])
+    data = main_module._get_market_live_data()
+    assert data["missing_sources"] == ["hy", "vix"]
+    assert (data["hy"], data["vix"]) == (None, None)
+    assert data["indices"] == [{"symbol": "^GSPC"}]
+
+
+def test_fred_sync_refetches_an_overlap_window(main_module, tmp_path, monkeypatch):
+    from datetime import date, timedelta
+
+    store = main_module._SeriesStore(str(tmp_path / "market_store.db"))
+    monkeypatch.setattr(main_module, "_series_store", store)
+    last = date.today() - timedelta(days=3)
+    revised = (last - timedelta(days=2)).isoformat()
+    store.upsert("VIXCLS", [(revised, 15.0), (last.isoformat(), 16.0)])
+
+    requested = []
+
+    def fetch(series_id, start, end):
+        requested.append(start)
+        return [(revised, 15.5)]
+
+    monkeypatch.setattr(main_module, "_fetch_fred_observations", fetch)
+    observations = main_module._sync_fred_series("VIXCLS", 400)
+    assert requested == [(last - timedelta(days=main_module.FRED_OVERLAP_DAYS)).isoformat()]
+    assert observations == [(revised, 15.5), (last.isoformat(), 16.0)]
+
+
+def test_series_store_snapshot_does_not_create_the_file(main_module, tmp_path):
+    path = tmp_path / "market_store.db"
+    snap = main_module._SeriesStore(str(path)).snapshot()
+    assert snap["series"] == {}
+    assert not path.exists()
+
+
+def test_rolling_series_matches_pandas_across_trims(main_module):
+    pd = pytest.importorskip("pandas")
+    rng = random.Random(3)
+    history = [(f"d{i:05d}", round(rng.uniform(1, 50), 2)) for i in range(400)]
+    state = main_module._RollingSeries(20, 10)
+    for k in range(0, 400 - 60, 7):
+        frame = history[k:k + 60]
+        values = state.update(frame)
+        expected = pd.Series([v for _, v in frame]).rolling(20, min_periods=10).median().tolist()
+        got = [state.median_at(i) for i in range(len(values))]
+        assert [round(x, 9) if x == x else None for x in got] == [round(x, 9) if x == x else None for x in expected]
+    assert state.stats["rebuilds"] == 1
+    assert len(state._values) <= 60 + 20
+
+
+def test_stale_index_does_not_pin_the_download_start(main_module, tmp_path, monkeypatch):
+    store = main_module._SeriesStore(str(tmp_path / "market_store.db"))
+    monkeypatch.setattr(main_module, "_series_store", store)
+    monkeypatch.setattr(main_module, "MARKET_INDICES", [("^GSPC", "S&P 500"), ("^IXIC", "NASDAQ"), ("^OLD", "Delisted")])
+    store.upsert_bars({
+        "^GSPC": [("2025-03-03", 100.0), ("2025-03-04", 101.0)],
+        "^IXIC": [("2025-03-04", 200.0), ("2025-03-05", 202.0)],
+        "^OLD": [("2024-11-01", 50.0), ("2024-11-04", 51.0)],
+    })
+    starts = []
+    monkeypatch.setattr(main_module, "_index_bar_fetcher", lambda symbols, start: starts.append(start) or {})
+
+    indices = main_module._fetch_market_indices()
+    assert starts == ["2025-03-04"]
+    assert [i["symbol"] for i in indices] == ["^GSPC", "^IXIC", "^OLD"]
@@ -0,0 +1,47 @@
+import re
+
+
+def _samples(client) -> dict[str, float]:
+    resp = client.get("/api/metrics")
+    assert resp.status_code == 200
+    samples = {}
+    for line in resp.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_scrape_labels_routes_and_counts_db_queries(client):
+    before = _samples(client)
+    past = client.get("/api/dates").json()[1]
+    etag = client.get(f"/api/screening/{past}").headers["etag"]
+    assert client.get(f"/api/screening/{past}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/ticker/T05", params={"from": "2025-01-03", "fields": "ma60"}).status_code == 200
+    assert client.get("/api/no/such/route").status_code == 404
+    after = _samples(client)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    screening = 'method="GET",route="/api/screening/{date}"'
+    ticker = 'method="GET",route="/api/ticker/{ticker}"'
+    # The 304 is answered before routing but still carries its route template
+    assert delta(f"eps_http_requests_total{{{screening},status=\"304\"}}") == 1
+    assert delta(f"eps_http_requests_total{{method=\"GET\",route=\"unmatched\",status=\"404\"}}") == 1
+
+    # Histograms: cumulative buckets ending in +Inf == _count, plus _sum
+    buckets = [
+        (name, value) for name, value in after.items()
+        if name.startswith(f"eps_http_request_duration_seconds_bucket{{{ticker},")
+    ]
+    assert buckets
+    assert buckets[-1][0].endswith('le="+Inf"}')
+    assert [v for _, v in buckets] == sorted(v for _, v in buckets)
+    assert buckets[-1][1] == after[f"eps_http_request_duration_seconds_count{{{ticker}}}"]
+    assert after[f"eps_http_request_duration_seconds_sum{{{ticker}}}"] > 0
+
+    # SQLite statements run on the db executor are charged to the request
+    assert delta(f"eps_http_request_db_queries_count{{{ticker}}}") == 1
+    assert delta(f"eps_http_request_db_queries_sum{{{ticker}}}") > 0
+    assert not any(re.search(r'route="/api/(ticker|screening)/[A-Z0-9-]', name) for name in after)
@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+
+def test_portfolio_history_stream_matches_grouped_history(client):
+    grouped = client.get("/api/portfolio/history").json()
+    resp = client.get("/api/portfolio/history/stream", params={"format": "ndjson"})
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert {line["date"]: line["entries"] for line in lines} == grouped
+
+
+def test_portfolio_history_stream_checks_ticker_info_once(main_module, client, tmp_path, monkeypatch):
+    index = main_module._TickerInfoIndex(str(tmp_path / "missing.json"))
+    stamp = index._stamp
+    calls = []
+    monkeypatch.setattr(index, "_stamp", lambda: calls.append(1) or stamp())
+    monkeypatch.setattr(main_module, "_ticker_info", index)
+
+    resp = client.get("/api/portfolio/history/stream", params={"format": "json"})
+    assert resp.status_code == 200
+    assert sum(len(entries) for entries in resp.json().values()) > 1
+    assert len(calls) == 1
+
+
+def test_open_streams_are_capped_and_hold_no_pool_slot(main_module, monkeypatch):
+    executor = main_module._db_executor
+    monkeypatch.setattr(executor, "max_streams", 1)
+
+    async def scenario():
+        first = await main_module.stream_portfolio_history(fmt="ndjson")
+        with pytest.raises(HTTPException) as exc:
+            await main_module.stream_portfolio_history(fmt="ndjson")
+        assert exc.value.status_code == 503
+
+        assert await first.body_iterator.__anext__()  # stream is open, cursor mid-way
+        assert main_module._db_pool.snapshot()["in_use"] == 0
+        await first.body_iterator.aclose()  # client went away
+        assert executor.snapshot()["streams"] == 0
+
+        again = await main_module.stream_portfolio_history(fmt="ndjson")
+        assert [chunk async for chunk in again.body_iterator]
+
+    asyncio.run(scenario())
+    assert executor.snapshot()["streams"] == 0
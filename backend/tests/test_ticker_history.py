@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.parametrize("metric", ["date", "no_such_column"])
+def test_non_numeric_metric_is_rejected(client, metric):
+    resp = client.get("/api/ticker/NVDA", params={"points": 3, "metric": metric})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == f"Unknown metric: {metric}"
+
+
+def test_downsampled_history(client):
+    resp = client.get("/api/ticker/NVDA", params={"points": 3, "metric": "score", "fields": "score"})
+    assert resp.status_code == 200
+    history = resp.json()["history"]
+    assert len(history) == 3
+    assert set(history[0]) == {"date", "score"}
+
+
+def test_history_sql_memo_is_canonical_and_bounded(main_module, monkeypatch):
+    registry = main_module._SchemaRegistry(max_sql=2)
+    monkeypatch.setattr(main_module, "_schema", registry)
+    with main_module.get_db() as conn:
+        a, _ = main_module._ticker_history_sql(conn, "NVDA", ["date", "score", "price"], None, None)
+        b, _ = main_module._ticker_history_sql(conn, "NVDA", ["price", "date", "score"], None, None)
+        assert a == b
+        assert registry.stats["sql_compiled"] == 1
+        for cols in (["date", "ma60"], ["date", "ntm_7d"], ["date", "ntm_30d"]):
+            main_module._ticker_history_sql(conn, "NVDA", cols, None, None)
+    assert registry.snapshot()["cached_sql"] == 2
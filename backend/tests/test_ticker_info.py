@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+
+
+def _write_cache(path, short_name: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"NVDA": {"shortName": short_name, "industry": "반도체"}}, f, ensure_ascii=False)
+
+
+def test_concurrent_first_load_waits_for_records(main_module, tmp_path, monkeypatch):
+    path = tmp_path / "ticker_info_cache.json"
+    _write_cache(path, "NVIDIA")
+    index = main_module._TickerInfoIndex(str(path))
+    load = index._load
+
+    def slow_load(previous):
+        time.sleep(0.2)
+        return load(previous)
+
+    monkeypatch.setattr(index, "_load", slow_load)
+    names = []
+    threads = [threading.Thread(target=lambda: names.append(index.get("NVDA").short_name)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert names == ["NVIDIA"] * 8
+    assert index.snapshot()["reloads"] == 1
+
+
+def test_reload_invalidates_stored_payloads_and_etags(main_module, client, tmp_path, monkeypatch):
+    path = tmp_path / "ticker_info_cache.json"
+    _write_cache(path, "NVIDIA")
+    monkeypatch.setattr(main_module, "_ticker_info", main_module._TickerInfoIndex(str(path)))
+    past = client.get("/api/dates").json()[1]
+
+    def nvda_name(resp):
+        return next(r["short_name"] for r in resp.json() if r["ticker"] == "NVDA")
+
+    first = client.get(f"/api/screening/{past}")
+    assert client.get(f"/api/screening/{past}").status_code == 200  # served from the store
+    _write_cache(path, "NVIDIA Corporation")
+
+    second = client.get(f"/api/screening/{past}", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert (nvda_name(first), nvda_name(second)) == ("NVIDIA", "NVIDIA Corporation")
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Candidate, PortfolioEntry, TickerHistory, ScreeningStats, ExitedStock, MarketStatus } from '../types';
+import type { Candidate, PortfolioEntry, TickerHistory, TickerChartPoint, ScreeningStats, ExitedStock, MarketStatus, DashboardBundle } from '../types';
 
 const api = axios.create({ baseURL: '/api' });
 
@@ -12,12 +12,27 @@ export const fetchScreening = (date: string) =>
 export const fetchPortfolio = (date: string) =>
   api.get<PortfolioEntry[]>(`/portfolio/${date}`).then(r => r.data);
 
+// Grouped by date on the server; flattened here (newest date first)
 export const fetchPortfolioHistory = () =>
-  api.get<PortfolioEntry[]>('/portfolio/history').then(r => r.data);
-
-export const fetchTickerHistory = (ticker: string) =>
-  api.get<{ ticker: string; short_name: string; industry_en: string; industry_kr: string; history: TickerHistory[] }>(`/ticker/${ticker}`)
-    .then(r => r.data);
+  api.get<Record<string, PortfolioEntry[]>>('/portfolio/history').then(r => Object.values(r.data).flat());
+
+export interface TickerHistoryQuery {
+  from?: string;
+  to?: string;
+  fields?: string[];
+  points?: number;
+  metric?: string;
+}
+
+export const fetchTickerHistory = (ticker: string, query: TickerHistoryQuery = {}) =>
+  api.get<{ ticker: string; short_name: string; industry_en: string; industry_kr: string; history: TickerHistory[] }>(`/ticker/${ticker}`, {
+    params: { ...query, fields: query.fields?.join(',') },
+  }).then(r => r.data);
+
+export const fetchTickerChart = (ticker: string, metric: string, points: number) =>
+  api.get<{ ticker: string; history: TickerChartPoint[] }>(`/ticker/${ticker}`, {
+    params: { fields: 'price,ma60,adj_score,adj_gap', metric, points },
+  }).then(r => r.data.history);
 
 export const fetchStats = (date: string) =>
   api.get<ScreeningStats>(`/stats/${date}`).then(r => r.data);
@@ -28,4 +43,5 @@ export const fetchExited = (date: string) =>
 export const fetchMarketLive = () =>
   api.get<MarketStatus>('/market/live').then(r => r.data);
 
-
+export const fetchDashboard = (date: string) =>
+  api.get<DashboardBundle>(`/dashboard/${date}`).then(r => r.data);
@@ -13,10 +13,10 @@ import {
   ReferenceLine,
   Cell,
 } from 'recharts'
-import type { TickerHistory } from '../types'
+import type { TickerChartPoint } from '../types'
 
 interface ScoreChartProps {
-  data: TickerHistory[];
+  data: TickerChartPoint[];
   metric: 'adj_score' | 'adj_gap' | 'price';
   embedded?: boolean;
 }
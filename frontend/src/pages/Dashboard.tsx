@@ -1,13 +1,6 @@
 import { useState, useEffect, useMemo } from 'react'
 import type { Candidate, ScreeningStats, PortfolioEntry, ExitedStock, MarketStatus } from '../types'
-import {
-  fetchDates,
-  fetchScreening,
-  fetchStats,
-  fetchPortfolio,
-  fetchExited,
-  fetchMarketLive,
-} from '../api/client'
+import { fetchDates, fetchDashboard, fetchMarketLive } from '../api/client'
 import MarketPulse from '../components/MarketPulse'
 import ScreeningStatsCards from '../components/MarketStatus'
 import CandidatesTable from '../components/CandidatesTable'
@@ -103,20 +96,18 @@ function Dashboard() {
     setIsLoading(true)
     setError(null)
 
-    Promise.all([
-      fetchScreening(selectedDate),
-      fetchStats(selectedDate),
-      fetchPortfolio(selectedDate),
-      fetchExited(selectedDate),
-      fetchMarketLive().catch(() => null),
-    ])
-      .then(([candidatesData, statsData, portfolioData, exitedData, marketData]) => {
-        setCandidates(candidatesData)
-        setStats(statsData)
-        setPortfolio(portfolioData)
-        setExited(exitedData)
-        setMarket(marketData)
+    fetchDashboard(selectedDate)
+      .then(bundle => {
+        setCandidates(bundle.screening)
+        setStats(bundle.stats)
+        setPortfolio(bundle.portfolio)
+        setExited(bundle.exited)
+        setMarket(bundle.market)
         setIsLoading(false)
+        // null while the server's first market fetch is still running
+        if (!bundle.market) {
+          fetchMarketLive().then(setMarket).catch(() => null)
+        }
       })
       .catch(err => {
         setError(`데이터 로딩 실패: ${err.message}`)
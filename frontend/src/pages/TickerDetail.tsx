@@ -1,10 +1,21 @@
 import { useState, useEffect } from 'react'
 import { useParams, Link } from 'react-router-dom'
-import type { TickerHistory } from '../types'
-import { fetchTickerHistory } from '../api/client'
+import type { TickerHistory, TickerChartPoint } from '../types'
+import { fetchDates, fetchTickerHistory, fetchTickerChart } from '../api/client'
 import ScoreChart from '../components/ScoreChart'
 import { ArrowLeft, TrendingUp, TrendingDown } from 'lucide-react'
 
+// Detail rows (latest values, rank history, table) cover this many days up
+// to the latest screening date (not the browser clock, so a stale DB still
+// shows a full window); charts span the full history, downsampled
+// server-side to CHART_POINTS.
+const DETAIL_WINDOW_DAYS = 365
+const CHART_POINTS = 500
+
+function daysBefore(date: string, days: number): string {
+  return new Date(Date.parse(date) - days * 86400000).toISOString().slice(0, 10)
+}
+
 function formatNumber(val: number | null | undefined, decimals: number = 2): string {
   if (val === null || val === undefined) return '-'
   return val.toFixed(decimals)
@@ -82,8 +93,10 @@ function TickerDetailSkeleton({ ticker: _ticker }: { ticker?: string }) {
 function TickerDetail() {
   const { ticker } = useParams<{ ticker: string }>()
   const [history, setHistory] = useState<TickerHistory[]>([])
+  const [chartData, setChartData] = useState<TickerChartPoint[]>([])
   const [shortName, setShortName] = useState<string>('')
   const [industryKr, setIndustryKr] = useState<string>('')
+  const [windowFrom, setWindowFrom] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [activeChart, setActiveChart] = useState<'price' | 'adj_score' | 'adj_gap'>('price')
@@ -94,7 +107,12 @@ function TickerDetail() {
     setIsLoading(true)
     setError(null)
 
-    fetchTickerHistory(ticker)
+    fetchDates()
+      .then(dates => {
+        const from = dates.length > 0 ? daysBefore(dates[0], DETAIL_WINDOW_DAYS) : null
+        setWindowFrom(from)
+        return fetchTickerHistory(ticker, from ? { from } : {})
+      })
       .then(data => {
         setShortName(data.short_name || '')
         setIndustryKr(data.industry_kr || '')
@@ -107,6 +125,14 @@ function TickerDetail() {
       })
   }, [ticker])
 
+  useEffect(() => {
+    if (!ticker) return
+
+    fetchTickerChart(ticker, activeChart, CHART_POINTS)
+      .then(setChartData)
+      .catch(() => setChartData([]))
+  }, [ticker, activeChart])
+
   const latest = history.length > 0 ? history[history.length - 1] : null
 
   const priceVsMa = latest && latest.ma60 > 0
@@ -304,7 +330,7 @@ function TickerDetail() {
           ))}
         </div>
         <div>
-          <ScoreChart data={history} metric={activeChart} embedded />
+          <ScoreChart data={chartData} metric={activeChart} embedded />
         </div>
       </div>
 
@@ -314,7 +340,9 @@ function TickerDetail() {
           <div className="flex items-center gap-3">
             <div className="w-1 h-4 bg-slate-500 rounded-full" />
             <h3 className="text-sm font-semibold text-slate-200">히스토리 데이터</h3>
-            <span className="text-xs text-slate-500">최근 30일</span>
+            <span className="text-xs text-slate-500">
+              최근 30일{windowFrom && ` · 상세 데이터는 ${windowFrom} 이후 (최신 기준일로부터 ${DETAIL_WINDOW_DAYS}일)`}
+            </span>
           </div>
         </div>
         <div className="overflow-x-auto">
@@ -29,7 +29,10 @@ export interface MarketStatus {
   signal_dots: { hy_ok: boolean; vix_ok: boolean };
   final_action: string;
   portfolio_mode: 'normal' | 'caution' | 'reduced' | 'stop';
+  missing_sources: string[];
   cached_at: string;
+  age_seconds: number;
+  stale: boolean;
 }
 
 export interface Candidate {
@@ -107,6 +110,8 @@ export interface TickerHistory {
   seg4?: number;
 }
 
+export type TickerChartPoint = Pick<TickerHistory, 'date' | 'price' | 'ma60' | 'adj_score' | 'adj_gap'>;
+
 export interface ScreeningStats {
   total_screened: number;
   total_eligible: number;
@@ -154,3 +159,12 @@ export interface ExitedStock {
   rev_down30?: number;
   exit_reason?: string;
 }
+
+export interface DashboardBundle {
+  date: string;
+  screening: Candidate[];
+  stats: ScreeningStats;
+  portfolio: PortfolioEntry[];
+  exited: ExitedStock[];
+  market: MarketStatus | null;
+}